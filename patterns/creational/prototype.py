@@ -1,6 +1,31 @@
 import copy
+import mmap
+import pickle
+import struct
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import (
+    Callable,
+    Dict,
+    Any,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+_IMMUTABLE_TYPES: Tuple[type, ...] = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    range,
+)
+_snapshot_magic: bytes = b"PROTO5\0\0"
+_snapshot_header: struct.Struct = struct.Struct("<8sQQ")
 
 
 class Machine(ABC):
@@ -25,23 +50,364 @@ class Car(Machine):
         )
 
 
+def is_immutable(value: Any) -> bool:
+    """Checks if a value can be shared between clones."""
+    if type(value) in _IMMUTABLE_TYPES:
+        return True
+    if type(value) in (tuple, frozenset):
+        return all(is_immutable(item) for item in value)
+    return False
+
+
+_HEAP_TYPE: int = (
+    1 << 9
+)  # Py_TPFLAGS_HEAPTYPE, set on classes defined in Python
+
+
+def _has_plain_state(cls: type) -> bool:
+    """Checks if a class keeps its whole state in a plain `__dict__`.
+
+    Subclasses of builtins such as `float` or `list` keep a value outside
+    of their `__dict__`, so they are never plain.
+    """
+    getstate: Any = getattr(object, "__getstate__", None)
+    slots: Any = (
+        slot
+        for klass in cls.__mro__
+        for slot in vars(klass).get("__slots__", ())
+        if slot not in ("__dict__", "__weakref__")
+    )
+    return (
+        all(
+            klass is object or klass.__flags__ & _HEAP_TYPE
+            for klass in cls.__mro__
+        )
+        and not any(slots)
+        and not hasattr(cls, "__deepcopy__")
+        and not hasattr(cls, "__setstate__")
+        and getattr(cls, "__getstate__", None) is getstate
+        and cls.__reduce_ex__ is object.__reduce_ex__
+        and cls.__reduce__ is object.__reduce__
+    )
+
+
+_plain_classes: Dict[type, bool] = {}
+
+
+def _copy_list(value: list, memo: Dict[int, Any]) -> list:
+    result: list = []
+    memo[id(value)] = result
+    result.extend(copy_value(item, memo) for item in value)
+    return result
+
+
+def _copy_dict(value: dict, memo: Dict[int, Any]) -> dict:
+    result: dict = {}
+    memo[id(value)] = result
+    for key, item in value.items():
+        result[copy_value(key, memo)] = copy_value(item, memo)
+    return result
+
+
+def _copy_set(value: set, memo: Dict[int, Any]) -> set:
+    result: set = {copy_value(item, memo) for item in value}
+    memo[id(value)] = result
+    return result
+
+
+def _copy_tuple(value: tuple, memo: Dict[int, Any]) -> tuple:
+    result: tuple = tuple(copy_value(item, memo) for item in value)
+    if all(new is old for new, old in zip(result, value)):
+        return value
+    memo[id(value)] = result
+    return result
+
+
+_copiers: Dict[type, Callable[[Any, Dict[int, Any]], Any]] = {
+    list: _copy_list,
+    dict: _copy_dict,
+    set: _copy_set,
+    tuple: _copy_tuple,
+}
+
+
+def _copy_instance(value: Any, memo: Dict[int, Any]) -> Any:
+    cls: type = type(value)
+    obj: Any = cls.__new__(cls)
+    memo[id(value)] = obj
+    obj.__dict__.update(
+        (name, copy_value(item, memo)) for name, item in vars(value).items()
+    )
+    return obj
+
+
+def copy_value(value: Any, memo: Dict[int, Any]) -> Any:
+    """Recursively copies mutable containers and plain objects only.
+
+    Anything else is handed over to `copy.deepcopy` with a shared memo.
+    """
+    cls: type = type(value)
+    if cls in _IMMUTABLE_TYPES:
+        return value
+    try:
+        return memo[id(value)]
+    except KeyError:
+        pass
+    copier: Any = _copiers.get(cls)
+    if copier is not None:
+        return copier(value, memo)
+    plain: Any = _plain_classes.get(cls)
+    if plain is None:
+        plain = _plain_classes[cls] = hasattr(
+            value, "__dict__"
+        ) and _has_plain_state(cls)
+    if plain:
+        return _copy_instance(value, memo)
+    return copy.deepcopy(value, memo)
+
+
+class ClonePlan(ABC):
+    """Abstract interface of a precomputed clone recipe."""
+
+    @abstractmethod
+    def clone(self, machine: Machine) -> Machine:
+        pass
+
+
+class DeepClonePlan(ClonePlan):
+    """Falls back to a generic deep copy."""
+
+    def clone(self, machine: Machine) -> Machine:
+        return copy.deepcopy(machine)
+
+
+class CustomClonePlan(ClonePlan):
+    """Delegates to a user declared `__clone__` fast path."""
+
+    def clone(self, machine: Machine) -> Machine:
+        return machine.__clone__()  # type: ignore
+
+
+class FieldClonePlan(ClonePlan):
+    """Shares immutable fields and recursively copies the rest of them."""
+
+    def __init__(self, shared: FrozenSet[str]) -> None:
+        self._shared: FrozenSet[str] = shared
+
+    @property
+    def shared(self) -> FrozenSet[str]:
+        return self._shared
+
+    def clone(self, machine: Machine) -> Machine:
+        cls: type = type(machine)
+        obj: Any = cls.__new__(cls)
+        state: Dict[str, Any] = machine.__dict__.copy()
+        mutable: Any = state.keys() - self._shared
+        if mutable:
+            memo: Dict[int, Any] = {id(machine): obj}
+            for name in mutable:  # type: str
+                state[name] = copy_value(state[name], memo)
+        obj.__dict__.update(state)
+        return obj
+
+
+def clone_plan(
+    machine: Machine, previous: Optional[ClonePlan] = None
+) -> ClonePlan:
+    """Computes a clone plan for a class of a given machine.
+
+    A previous plan of the same class gets narrowed, so a field is shared
+    only if it is immutable in every registered machine of that class.
+    """
+    cls: type = type(machine)
+    if callable(getattr(cls, "__clone__", None)):
+        return CustomClonePlan()
+    if not _has_plain_state(cls):
+        return DeepClonePlan()
+    shared: FrozenSet[str] = frozenset(
+        name for name, value in vars(machine).items() if is_immutable(value)
+    )
+    if isinstance(previous, FieldClonePlan):
+        shared &= previous.shared
+    return FieldClonePlan(shared)
+
+
+class LazyClone:
+    """A copy-on-write view of a template machine.
+
+    Reads fall through to the template's state, a mutable value is copied
+    into the clone on its first access and writes always land in the clone,
+    so a template must not be changed while its lazy clones are alive.
+    Copies of one clone share a memo, keeping aliased fields aliased.
+    """
+
+    __slots__ = ("_memo",)
+    _template: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            value: Any = self._template.__dict__[name]
+        except KeyError:
+            raise AttributeError(
+                f'"{type(self).__name__}" object has no attribute "{name}"'
+            ) from None
+        if not is_immutable(value):
+            try:
+                memo: Dict[int, Any] = self._memo
+            except AttributeError:
+                # pylint:disable=attribute-defined-outside-init
+                memo = self._memo = {id(self._template): self}
+            value = self.__dict__[name] = copy_value(value, memo)
+        return value
+
+
+class _TemplateField:
+    """Reads a template field which shadows a class attribute.
+
+    Being a non-data descriptor, it gives way to the clone's own value.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name: str = name
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return obj.__getattr__(self._name)
+
+
+def lazy_class(machine: Machine) -> Optional[type]:
+    """Builds a lazy clone class viewing a given template machine."""
+    cls: type = type(machine)
+    if not _has_plain_state(cls):
+        return None
+    namespace: Dict[str, Any] = {
+        name: _TemplateField(name)
+        for name in vars(machine)
+        if hasattr(cls, name)
+    }
+    namespace.update(_template=machine, __module__=cls.__module__)
+    return type(cls)(f"Lazy{cls.__name__}", (LazyClone, cls), namespace)
+
+
+def _split_snapshot(
+    view: memoryview, path: str
+) -> Tuple[memoryview, List[memoryview]]:
+    """Splits a snapshot into a pickle payload and out-of-band buffers."""
+    magic, size, count = _snapshot_header.unpack_from(view)
+    if magic != _snapshot_magic:
+        raise ValueError(f'"{path}" is not a prototype snapshot!')
+    offset: int = _snapshot_header.size
+    lengths: Tuple[int, ...] = struct.unpack_from(f"<{count}Q", view, offset)
+    offset += struct.calcsize(f"<{count}Q")
+    payload: memoryview = view[offset : offset + size]
+    offset += size
+    buffers: List[memoryview] = []
+    for length in lengths:  # type: int
+        buffers.append(view[offset : offset + length])
+        offset += length
+    return payload, buffers
+
+
 class Prototype:
-    """A prototype object."""
+    """A prototype object.
+
+    Registered machines are treated as templates: a clone plan is computed
+    once per class on registration, so re-register a machine if its fields
+    are reassigned to mutable values afterwards.
+    """
 
     def __init__(self) -> None:
         self._elements: Dict[Any, Any] = {}
+        self._plans: Dict[type, ClonePlan] = {}
+        self._lazy: Dict[Any, Optional[type]] = {}
 
     def register_object(self, name: str, machine: Machine) -> None:
+        cls: type = type(machine)
+        self._plans[cls] = clone_plan(machine, self._plans.get(cls))
         self._elements[name] = machine
+        self._lazy.pop(name, None)
 
     def unregister_object(self, name: str) -> None:
         del self._elements[name]
+        self._lazy.pop(name, None)
 
     def clone(self, name: str, **attr: Any) -> Car:
-        obj: Any = copy.deepcopy(self._elements[name])
+        machine: Any = self._elements[name]
+        obj: Any = self._plans[type(machine)].clone(machine)
         obj.__dict__.update(attr)
         return obj
 
+    def lazy_clone(self, name: str, **attr: Any) -> Machine:
+        """Clones a machine as a copy-on-write view of its template.
+
+        Given attributes are applied as overlay values. Machines which do not
+        keep a plain `__dict__` state are cloned eagerly instead.
+        """
+        try:
+            cls: Optional[type] = self._lazy[name]
+        except KeyError:
+            cls = self._lazy[name] = lazy_class(self._elements[name])
+        if cls is None:
+            return self.clone(name, **attr)
+        obj: Any = cls.__new__(cls)
+        if attr:
+            obj.__dict__.update(attr)
+        return obj
+
+    def clone_many(
+        self, name: str, overrides: Iterable[Dict[str, Any]]
+    ) -> List[Machine]:
+        """Clones a machine once per given overrides mapping."""
+        machine: Any = self._elements[name]
+        plan: ClonePlan = self._plans[type(machine)]
+        clones: List[Machine] = []
+        for attr in overrides:  # type: Dict[str, Any]
+            obj: Any = plan.clone(machine)
+            obj.__dict__.update(attr)
+            clones.append(obj)
+        return clones
+
+    def dump(self, path: str) -> None:
+        """Snapshots registered machines into a file.
+
+        Uses pickle protocol 5, so large buffers are written out-of-band
+        right after the pickle payload and are never copied into it.
+        """
+        buffers: List[pickle.PickleBuffer] = []
+        payload: bytes = pickle.dumps(
+            self._elements, protocol=5, buffer_callback=buffers.append
+        )
+        views: List[memoryview] = [buffer.raw() for buffer in buffers]
+        with open(path, "wb") as file:
+            file.write(
+                _snapshot_header.pack(_snapshot_magic, len(payload), len(views))
+            )
+            file.write(
+                struct.pack(f"<{len(views)}Q", *(view.nbytes for view in views))
+            )
+            file.write(payload)
+            for view in views:  # type: memoryview
+                file.write(view)
+
+    @classmethod
+    def load(cls, path: str) -> "Prototype":
+        """Restores a prototype from a snapshot file.
+
+        The file is memory-mapped and out-of-band buffers are handed over as
+        views of that map. Only load snapshots from a trusted source.
+        """
+        with open(path, "rb") as file:
+            mapped: mmap.mmap = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_COPY
+            )
+        payload, buffers = _split_snapshot(memoryview(mapped), path)
+        prototype: Prototype = cls()
+        elements: Dict[Any, Any] = pickle.loads(payload, buffers=buffers)
+        for name, machine in elements.items():  # type: str, Machine
+            prototype.register_object(name, machine)
+        return prototype
+
 
 # prototypical car object to be cloned
 primary_car: Machine = Car()
@@ -52,3 +418,70 @@ prototype.register_object("skylark", primary_car)
 # clone a car object
 cloned_car: Machine = prototype.clone("skylark")
 print(cloned_car.summary())
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    import timeit
+    import tracemalloc
+
+    class Garage(Machine):
+        """A nested machine keeps mutable containers."""
+
+        def __init__(self) -> None:
+            self._name: str = "Garage"
+            self._cars: list = [Car() for _ in range(3)]
+            self._options: Dict[str, list] = {"tires": ["winter", "summer"]}
+
+        def summary(self) -> str:
+            return f"Garage details: {self._name} | {len(self._cars)} cars"
+
+    templates: Dict[str, Machine] = {"skylark": primary_car, "garage": Garage()}
+    prototype.register_object("garage", templates["garage"])
+    number: int = 100_000
+    for name, template in templates.items():  # type: str, Machine
+        deep: float = timeit.timeit(
+            lambda template=template: copy.deepcopy(template), number=number
+        )
+        planned: float = timeit.timeit(
+            lambda name=name: prototype.clone(name), number=number
+        )
+        print(
+            f"{name}: deepcopy {deep:.3f}s, clone plan {planned:.3f}s "
+            f"for {number} clones ({deep / planned:.1f}x)"
+        )
+
+    overrides: List[Dict[str, Any]] = [{"_color": "Blue"}] * number
+    single: float = timeit.timeit(
+        lambda: [prototype.clone("skylark", **attr) for attr in overrides],
+        number=1,
+    )
+    bulk: float = timeit.timeit(
+        lambda: prototype.clone_many("skylark", overrides), number=1
+    )
+    print(f"skylark: clone {single:.3f}s, clone_many {bulk:.3f}s")
+
+    for method in (prototype.clone, prototype.lazy_clone):  # type: Any
+        started: float = time.perf_counter()
+        clones: List[Machine] = [method("skylark") for _ in range(1_000_000)]
+        elapsed: float = time.perf_counter() - started
+        del clones
+        tracemalloc.start()
+        clones = [method("skylark") for _ in range(1_000_000)]
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"skylark: 1M {method.__name__} {elapsed:.3f}s, "
+            f"{peak / len(clones):.0f} bytes per clone"
+        )
+        del clones
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot: str = os.path.join(directory, "prototype.snapshot")
+        prototype.dump(snapshot)
+        loaded: float = timeit.timeit(
+            lambda: Prototype.load(snapshot), number=100
+        )
+        print(f"snapshot load {loaded / 100 * 1000:.3f}ms")
@@ -1,18 +1,41 @@
-from typing import Any, Dict
+import asyncio
+import contextlib
+import contextvars
+import functools
+import inspect
+import multiprocessing
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # pragma: no cover
+    resource_tracker = shared_memory = None
 
 
 class SingletonMeta(type):
-    """Singleton metaclass implementation."""
+    """Singleton metaclass implementation.
+
+    Uses double-checked locking, so only a first call takes a lock.
+    """
 
     def __init__(cls, cls_name: str, bases: tuple, namespace: dict):
         cls.__instance = None
+        cls.__lock = threading.Lock()
         super().__init__(cls_name, bases, namespace)
 
     def __call__(cls, *args, **kwargs):
-        if cls.__instance is None:
-            cls.__instance = super().__call__(*args, **kwargs)
-            return cls.__instance
-        return cls.__instance
+        instance: Any = cls.__instance
+        if instance is None:
+            with cls.__lock:
+                if cls.__instance is None:
+                    cls.__instance = super().__call__(*args, **kwargs)
+                instance = cls.__instance
+        return instance
 
 
 class Single(metaclass=SingletonMeta):
@@ -22,28 +45,150 @@ class Single(metaclass=SingletonMeta):
 
 
 class Singleton:
-    """Makes all instances as the same object."""
+    """Makes all instances as the same object.
+
+    Every subclass keeps an instance and a lock of its own.
+    """
 
     _instance: "Singleton"
+    _lock: threading.Lock = threading.Lock()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._lock = threading.Lock()
 
     def __new__(cls) -> "Singleton":
-        if not hasattr(cls, "_instance"):
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        instance: Any = cls.__dict__.get("_instance")
+        if instance is None:
+            with cls._lock:
+                instance = cls.__dict__.get("_instance")
+                if instance is None:
+                    instance = cls._instance = super().__new__(cls)
+        return instance
+
+
+def async_singleton(cls: Any) -> Any:
+    """A singleton decorator for classes awaiting `__ainit__` on creation.
+
+    Concurrent first callers await a single in-flight initialization task,
+    while a failed initialization is dropped so a next call retries it.
+    """
+    instances: Dict[Any, Any] = {}
+    pending: Dict[Any, "asyncio.Future[Any]"] = {}
+
+    async def create() -> Any:
+        instance: Any = cls()
+        await instance.__ainit__()
+        return instance
+
+    def settle(task: "asyncio.Future[Any]") -> None:
+        if pending.get(cls) is task:
+            del pending[cls]
+        if not task.cancelled() and task.exception() is None:
+            instances[cls] = task.result()
+
+    async def get_instance() -> Any:
+        if cls in instances:
+            return instances[cls]
+        task: Any = pending.get(cls)
+        if task is None:
+            task = pending[cls] = asyncio.ensure_future(create())
+            task.add_done_callback(settle)
+        return await asyncio.shield(task)
+
+    return get_instance
 
 
 def singleton(cls: Any) -> Any:
-    """A singleton decorator."""
+    """A thread-safe singleton decorator.
+
+    Classes with an async `__ainit__` get an awaitable factory instead.
+    """
+    if inspect.iscoroutinefunction(getattr(cls, "__ainit__", None)):
+        return async_singleton(cls)
     instances: Dict[Any, Any] = {}
+    lock: threading.Lock = threading.Lock()
 
     def get_instance() -> Any:
         if cls not in instances:
-            instances[cls] = cls()
+            with lock:
+                if cls not in instances:
+                    instances[cls] = cls()
         return instances[cls]
 
     return get_instance
 
 
+_teardowns: "contextvars.ContextVar[Optional[List[Callable[[], None]]]]" = (
+    contextvars.ContextVar("singleton_teardowns", default=None)
+)
+
+
+@contextlib.contextmanager
+def singleton_scope() -> Iterator[None]:
+    """Releases context singletons created within a scope on its exit."""
+    teardowns: List[Callable[[], None]] = []
+    token: Any = _teardowns.set(teardowns)
+    try:
+        yield
+    finally:
+        _teardowns.reset(token)
+        for teardown in reversed(teardowns):
+            teardown()
+
+
+def _context_owner() -> Any:
+    """Returns a current asyncio task or an identity of a current thread."""
+    try:
+        task: Any = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident() if task is None else task
+
+
+def context_singleton(
+    cls: Any = None, *, release: Optional[Callable[[Any], None]] = None
+) -> Any:
+    """A singleton decorator keeping one instance per thread or asyncio task.
+
+    Instances live in a context variable, so no lock is ever taken. A task
+    copies a context of its parent, so every instance is tagged with its
+    owner task or thread and is not shared with child tasks. Instances
+    created within `singleton_scope` are passed to `release` on its exit.
+    """
+    if cls is None:
+        return functools.partial(context_singleton, release=release)
+    instance_var: "contextvars.ContextVar[Tuple[Any, Any]]" = (
+        contextvars.ContextVar(f"{cls.__name__}_instance")
+    )
+
+    def get_instance() -> Any:
+        owner: Any = _context_owner()
+        try:
+            instance_owner, instance = instance_var.get()
+        except LookupError:
+            pass
+        else:
+            if instance_owner == owner:
+                return instance
+        instance = cls()
+        token: Any = instance_var.set((owner, instance))
+        teardowns: Optional[List[Callable[[], None]]] = _teardowns.get()
+        if teardowns is not None:
+
+            def teardown() -> None:
+                # a task spawned within a scope resets its own context copy
+                with contextlib.suppress(ValueError):
+                    instance_var.reset(token)
+                if release is not None:
+                    release(instance)
+
+            teardowns.append(teardown)
+        return instance
+
+    return get_instance
+
+
 @singleton
 class Bar:
     """A fancy object."""
@@ -51,6 +196,19 @@ class Bar:
     pass
 
 
+@singleton
+class ConnectionPool:
+    """A pool which has to warm up its connections before use."""
+
+    def __init__(self) -> None:
+        self.connections: list = []
+
+    async def __ainit__(self) -> None:
+        for number in range(3):  # type: int
+            await asyncio.sleep(0.01)
+            self.connections.append(f"connection {number}")
+
+
 print(Single() is Single())
 
 singleton_one: Singleton = Singleton()
@@ -88,6 +246,169 @@ class BorgSingleton(Borg):
         return str(self._shared_state)
 
 
+class SharedState:
+    """A key/value region kept in shared memory across processes.
+
+    Open addressing table of fixed size slots, each one guarded by a seqlock
+    counter: writers serialize on a process lock and bump the counter around
+    an update, readers take no lock and retry if the counter has moved.
+    Retries back off and give up after a timeout, since a writer which died
+    mid-update leaves its slot locked for good.
+    Create it before forking workers or hand it over to spawned ones.
+    """
+
+    _slot: struct.Struct = struct.Struct("<QB32sI")
+    _seq: struct.Struct = struct.Struct("<Q")
+    _read_timeout: float = 1.0
+
+    def __init__(
+        self, slots: int = 64, value_size: int = 256, name: Optional[str] = None
+    ) -> None:
+        if shared_memory is None:
+            raise ImportError("python 3.8 is required for shared memory!")
+        self._slots: int = slots
+        self._value_size: int = value_size
+        self._stride: int = self._slot.size + value_size
+        self._lock: Any = multiprocessing.Lock()
+        self._memory: Any = shared_memory.SharedMemory(
+            name=name, create=True, size=slots * self._stride
+        )
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return self._slots, self._value_size, self._lock, self._memory.name
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        self._slots, self._value_size, self._lock, name = state
+        self._stride = self._slot.size + self._value_size
+        self._memory = shared_memory.SharedMemory(name=name)
+        # an attached segment is owned and unlinked by its creator
+        resource_tracker.unregister(
+            getattr(self._memory, "_name", name), "shared_memory"
+        )
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def _key(self, key: str) -> bytes:
+        encoded: bytes = key.encode()
+        if len(encoded) > 32:
+            raise ValueError(f'"{key}" key should not exceed 32 bytes!')
+        return encoded
+
+    def _offsets(self, key: bytes) -> Iterator[int]:
+        start: int = zlib.crc32(key) % self._slots
+        for index in range(self._slots):  # type: int
+            yield ((start + index) % self._slots) * self._stride
+
+    def _read(self, offset: int) -> Tuple[bytes, bytes]:
+        buffer: memoryview = self._memory.buf
+        delay: float = 0.0
+        deadline: Optional[float] = None
+        while True:
+            seq, size, key, length = self._slot.unpack_from(buffer, offset)
+            if not seq % 2:
+                start: int = offset + self._slot.size
+                value: bytes = bytes(buffer[start : start + length])
+                if self._seq.unpack_from(buffer, offset)[0] == seq:
+                    return key[:size], value
+            if deadline is None:
+                deadline = time.monotonic() + self._read_timeout
+            elif time.monotonic() > deadline:
+                raise TimeoutError("Shared state slot is stuck in an update!")
+            time.sleep(delay)
+            delay = min(delay * 2 or 1e-6, 0.01)
+
+    def __getitem__(self, key: str) -> Any:
+        encoded: bytes = self._key(key)
+        for offset in self._offsets(encoded):  # type: int
+            found, value = self._read(offset)
+            if not found:
+                break
+            if found == encoded:
+                return pickle.loads(value)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        encoded: bytes = self._key(key)
+        payload: bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self._value_size:
+            raise ValueError(
+                f'"{key}" value should not exceed {self._value_size} bytes!'
+            )
+        buffer: memoryview = self._memory.buf
+        with self._lock:
+            for offset in self._offsets(encoded):  # type: int
+                seq, size, found, _ = self._slot.unpack_from(buffer, offset)
+                if size and found[:size] != encoded:
+                    continue
+                self._seq.pack_into(buffer, offset, seq + 1)
+                start: int = offset + self._slot.size
+                buffer[start : start + len(payload)] = payload
+                self._slot.pack_into(
+                    buffer, offset, seq + 1, len(encoded), encoded, len(payload)
+                )
+                self._seq.pack_into(buffer, offset, seq + 2)
+                return
+        raise ValueError("Shared state has no free slots left!")
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for index in range(self._slots):  # type: int
+            key, value = self._read(index * self._stride)
+            if key:
+                yield key.decode(), pickle.loads(value)
+
+    def close(self) -> None:
+        self._memory.close()
+
+    def unlink(self) -> None:
+        self._memory.unlink()
+
+
+class SharedBorg:
+    """Borg class keeping the same state of all instances across processes.
+
+    A state has to be shared before first use, e.g. in a parent process
+    before forking or in a pool initializer of spawned workers.
+    """
+
+    __slots__ = ()
+    _shared_state: Optional[SharedState] = None
+
+    def __init__(self, **kwargs: Any) -> None:
+        for name, value in kwargs.items():  # type: str, Any
+            setattr(self, name, value)
+
+    @classmethod
+    def share(cls, state: SharedState) -> None:
+        cls._shared_state = state
+
+    @classmethod
+    def _state(cls) -> SharedState:
+        if cls._shared_state is None:
+            raise ValueError(f'"{cls.__name__}" has no shared state!')
+        return cls._shared_state
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._state().__getitem__(name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._state().__setitem__(name, value)
+
+    def __str__(self) -> str:
+        return str(dict(self._state().items()))
+
+
 # Create a singleton object and add out first acronym
 x: Borg = BorgSingleton(HTTP="Hyper Text Transfer Protocol")
 print(x)
@@ -95,3 +416,161 @@ print(x)
 # Create another singleton which will add to the existent dict attribute
 y: Borg = BorgSingleton(SNMP="Simple Network Management Protocol")
 print(y)
+
+
+def _remember(acronym: str) -> str:
+    """Stores an acronym from a worker process into a shared borg."""
+    setattr(SharedBorg(), acronym, f"{acronym} set by a worker process")
+    return acronym
+
+
+if __name__ == "__main__":
+    import timeit
+    from concurrent.futures import ThreadPoolExecutor
+
+    async def burst() -> None:
+        pools: list = await asyncio.gather(
+            *(ConnectionPool() for _ in range(100))
+        )
+        print(all(pool is pools[0] for pool in pools), pools[0].connections)
+
+    asyncio.run(burst())
+
+    class RequestBuffer:
+        """A hot per-request object which is not thread-safe on its own."""
+
+        def __init__(self) -> None:
+            self.chunks: list = []
+
+        def write(self, chunk: str) -> None:
+            self.chunks.append(chunk)
+            if len(self.chunks) > 100:
+                self.chunks.clear()
+
+    global_buffer: Any = singleton(RequestBuffer)
+    buffer_lock: threading.Lock = threading.Lock()
+    scoped_buffer: Any = context_singleton(RequestBuffer)
+
+    def write_global(writes: int) -> None:
+        for _ in range(writes):
+            with buffer_lock:
+                global_buffer().write("chunk")
+
+    def write_scoped(writes: int) -> None:
+        with singleton_scope():
+            for _ in range(writes):
+                scoped_buffer().write("chunk")
+
+    async def write_async(writer: Any, writes: int) -> None:
+        writer(writes)
+        await asyncio.sleep(0)
+
+    async def gather_writes(writer: Any, tasks: int, writes: int) -> None:
+        await asyncio.gather(
+            *(write_async(writer, writes) for _ in range(tasks))
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for writer in (write_global, write_scoped):  # type: Any
+            started: float = time.perf_counter()
+            list(executor.map(writer, [100_000] * 8))
+            threaded: float = time.perf_counter() - started
+            started = time.perf_counter()
+            asyncio.run(gather_writes(writer, 1_000, 800))
+            concurrent: float = time.perf_counter() - started
+            print(
+                f"{writer.__name__}: thread pool {threaded:.3f}s, "
+                f"asyncio {concurrent:.3f}s for 800k writes"
+            )
+
+    def locked(cls: Any) -> Any:
+        """A singleton decorator which always takes a lock."""
+        instances: Dict[Any, Any] = {}
+        lock: threading.Lock = threading.Lock()
+
+        def get_instance() -> Any:
+            with lock:
+                if cls not in instances:
+                    instances[cls] = cls()
+                return instances[cls]
+
+        return get_instance
+
+    def variants() -> Dict[str, Any]:
+        """Builds fresh singleton classes of every kind."""
+
+        class Meta(metaclass=SingletonMeta):
+            pass
+
+        class New(Singleton):
+            pass
+
+        return {
+            "SingletonMeta": Meta,
+            "Singleton": New,
+            "singleton": singleton(type("Decorated", (), {})),
+            "locked": locked(type("Locked", (), {})),
+        }
+
+    def first_access(factory: Any, barrier: threading.Barrier) -> int:
+        barrier.wait()
+        return id(factory())
+
+    def steady_access(factory: Any, calls: int) -> None:
+        for _ in range(calls):
+            factory()
+
+    threads: int = 32
+    rounds: int = 100
+    calls: int = 100_000
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        first: Dict[str, float] = dict.fromkeys(variants(), 0.0)
+        for _ in range(rounds):
+            for name, factory in variants().items():  # type: str, Any
+                barrier: threading.Barrier = threading.Barrier(threads)
+                started: float = time.perf_counter()
+                ids: set = set(
+                    executor.map(
+                        first_access, [factory] * threads, [barrier] * threads
+                    )
+                )
+                first[name] += time.perf_counter() - started
+                assert len(ids) == 1, f"{name} created {len(ids)} instances"
+        for name, factory in variants().items():
+            factory()
+            started = time.perf_counter()
+            list(
+                executor.map(
+                    steady_access, [factory] * threads, [calls] * threads
+                )
+            )
+            steady: float = time.perf_counter() - started
+            print(
+                f"{name}: first access {first[name] / rounds * 1000:.3f}ms, "
+                f"steady state {steady:.3f}s for {threads}x{calls} calls"
+            )
+
+    shared_state: SharedState = SharedState()
+    SharedBorg.share(shared_state)
+    try:
+        SharedBorg(HTTP="Hyper Text Transfer Protocol")
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            pool.map(_remember, ("FTP", "SNMP", "SMTP"))
+        print(SharedBorg())
+        with multiprocessing.Manager() as manager:
+            managed: Any = manager.dict(HTTP="Hyper Text Transfer Protocol")
+            borg: SharedBorg = SharedBorg()
+            number: int = 10_000
+            statements: Tuple[Tuple[str, Any], ...] = (
+                ("manager read", lambda: managed["HTTP"]),
+                ("manager write", lambda: managed.__setitem__("HTTP", "-")),
+                ("shared read", lambda: shared_state["HTTP"]),
+                ("shared write", lambda: shared_state.__setitem__("HTTP", "-")),
+                ("shared borg read", lambda: borg.HTTP),
+            )
+            for name, stmt in statements:  # type: str, Any
+                latency: float = timeit.timeit(stmt, number=number) / number
+                print(f"{name}: {latency * 1_000_000:.2f}us")
+    finally:
+        shared_state.close()
+        shared_state.unlink()
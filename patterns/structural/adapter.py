@@ -1,5 +1,8 @@
+# pylint:disable=protected-access
+import inspect
 from abc import ABC, abstractmethod
-from typing import Any
+from types import FunctionType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 
 class Speaker(ABC):
@@ -22,6 +25,10 @@ class Korean(Speaker):
     def speak_korean(self) -> str:
         return "An-neyong?"
 
+    @staticmethod
+    def speak_korean_many(speakers: List["Korean"]) -> List[str]:
+        return ["An-neyong?"] * len(speakers)
+
 
 class British(Speaker):
     """English speaker."""
@@ -39,14 +46,192 @@ class British(Speaker):
 class Adapter:
     """Changes the generic method name to individualized method names."""
 
+    _targets: Dict[str, str] = {}
+
     def __init__(self, obj: Any, **adapted_method: Any) -> None:
         self._object = obj
         self.__dict__.update(adapted_method)
 
+    def _adapter_target(self, name: str) -> Optional[str]:
+        """Returns an adaptee method name behind a given adapter method.
+
+        Internal names are private, so adapted names cannot shadow them.
+        """
+        method: Any = self.__dict__.get(name)
+        if method is None:
+            return self._targets.get(name, name)
+        if getattr(method, "__self__", None) is self._object:
+            return method.__func__.__name__
+        return None
+
     def __getattr__(self, item: Any) -> Any:
         return getattr(self._object, item)
 
 
+def _forward_method(name: str, function: Callable[..., Any]) -> Any:
+    """Forwards a call to a plain function of an adaptee type.
+
+    A method with the same positional arguments is compiled if possible,
+    since packing `*args` and `**kwargs` costs more than the call itself.
+    """
+    parameters: List[inspect.Parameter] = list(
+        inspect.signature(function).parameters.values()
+    )[1:]
+    if all(
+        parameter.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
+        and parameter.default is inspect.Parameter.empty
+        and parameter.name != "_forwarded"
+        for parameter in parameters
+    ):
+        arguments: str = "".join(
+            f", {parameter.name}" for parameter in parameters
+        )
+        namespace: Dict[str, Any] = {"_forwarded": function}
+        exec(  # pylint:disable=exec-used
+            f"def {name}(self{arguments}):\n"
+            f"    return _forwarded(self._object{arguments})\n",
+            namespace,
+        )
+        method: Any = namespace[name]
+    else:
+
+        def method(self: Any, *args: Any, **kwargs: Any) -> Any:
+            return function(self._object, *args, **kwargs)
+
+        method.__name__ = name
+    method.__doc__ = function.__doc__
+    return method
+
+
+def _forward_attribute(name: str) -> property:
+    """Forwards an attribute access of any other kind to an adaptee."""
+    return property(lambda self: getattr(self._object, name))
+
+
+_adapter_classes: Dict[Tuple[type, Tuple[Tuple[str, str], ...]], type] = {}
+
+
+def adapter_class(adaptee: type, **adapted_method: str) -> type:
+    """Builds an adapter class with real forwarding methods.
+
+    Classes are cached per adaptee type and method mapping, where a mapping
+    relates an adapter method name to an adaptee method name.
+    """
+    key: Tuple[type, Tuple[Tuple[str, str], ...]] = (
+        adaptee,
+        tuple(sorted(adapted_method.items())),
+    )
+    try:
+        return _adapter_classes[key]
+    except KeyError:
+        pass
+    targets: Dict[str, str] = {
+        name: name for name in dir(adaptee) if not name.startswith("_")
+    }
+    targets.update(adapted_method)
+    namespace: Dict[str, Any] = {"__slots__": (), "_targets": targets}
+    for name, target in targets.items():  # type: str, str
+        attribute: Any = inspect.getattr_static(adaptee, target)
+        if isinstance(attribute, FunctionType):
+            namespace[name] = _forward_method(name, attribute)
+        else:
+            namespace[name] = _forward_attribute(target)
+    cls: type = type(f"{adaptee.__name__}Adapter", (Adapter,), namespace)
+    _adapter_classes[key] = cls
+    return cls
+
+
+def adapt(obj: Any, **adapted_method: str) -> Adapter:
+    """Adapts an object with a cached compiled adapter class."""
+    adapter: Any = adapter_class(type(obj), **adapted_method)
+    return adapter(obj)
+
+
+def _group_key(adapter: Any) -> Any:
+    """Builds a key shared by adapters of the same adaptee type and mapping."""
+    if not isinstance(adapter, Adapter):
+        return None
+    mapping: Tuple[Any, ...] = tuple(
+        sorted(
+            (
+                (
+                    name,
+                    getattr(method, "__func__", method),
+                    getattr(method, "__self__", None) is adapter._object,
+                )
+                for name, method in vars(adapter).items()
+                if name != "_object"
+            ),
+            key=lambda item: item[0],
+        )
+    )
+    try:
+        hash(mapping)
+    except TypeError:
+        return None
+    return type(adapter), type(adapter._object), mapping
+
+
+class AdapterCollection:
+    """Invokes a method of adapters group by group.
+
+    Adapters are grouped by adaptee type and method mapping, so a target
+    method gets resolved once per group and is called in a tight loop, or
+    through an adaptee's `<target>_many` batch method if it has one.
+    """
+
+    def __init__(self, adapters: Iterable[Any] = ()) -> None:
+        self._size: int = 0
+        self._groups: Dict[Any, Tuple[List[int], List[Any], List[Any]]] = {}
+        for adapter in adapters:
+            self.append(adapter)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, adapter: Any) -> None:
+        key: Any = _group_key(adapter)
+        indices, adapters, adaptees = self._groups.setdefault(key, ([], [], []))
+        indices.append(self._size)
+        adapters.append(adapter)
+        adaptees.append(adapter._object if key is not None else adapter)
+        self._size += 1
+
+    def invoke(self, name: str, *args: Any, **kwargs: Any) -> List[Any]:
+        """Invokes a method of all adapters keeping their original order."""
+        results: List[Any] = [None] * self._size
+        for key, group in self._groups.items():
+            values: Iterable[Any] = self._invoke_group(
+                key, group, name, args, kwargs
+            )
+            for index, value in zip(group[0], values):  # type: int, Any
+                results[index] = value
+        return results
+
+    @staticmethod
+    def _invoke_group(
+        key: Any,
+        group: Tuple[List[int], List[Any], List[Any]],
+        name: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Iterable[Any]:
+        _, adapters, adaptees = group
+        target: Optional[str] = (
+            None if key is None else adapters[0]._adapter_target(name)
+        )
+        if target is not None:
+            batch: Any = getattr(key[1], f"{target}_many", None)
+            if callable(batch):
+                return batch(adaptees, *args, **kwargs)
+            function: Any = inspect.getattr_static(key[1], target, None)
+            if isinstance(function, FunctionType):
+                return [
+                    function(adaptee, *args, **kwargs) for adaptee in adaptees
+                ]
+        return [getattr(adapter, name)(*args, **kwargs) for adapter in adapters]
+
+
 speakers: list = []
 korean = Korean()
 british = British()
@@ -55,3 +240,39 @@ speakers.append(Adapter(british, speak=british.speak_english))
 
 for speaker in speakers:
     print(f"{speaker.type()} says '{speaker.speak()}'")
+
+
+if __name__ == "__main__":
+    import timeit
+
+    compiled: list = [
+        adapt(korean, speak="speak_korean"),
+        adapt(british, speak="speak_english"),
+    ]
+    for speaker in compiled:
+        print(f"{speaker.type()} says '{speaker.speak()}'")
+
+    number: int = 1_000_000
+    for name, adapters in (("Adapter", speakers), ("adapt", compiled)):
+        elapsed: float = timeit.timeit(
+            lambda adapters=adapters: [
+                (speaker.type(), speaker.speak()) for speaker in adapters
+            ],
+            number=number,
+        )
+        print(f"{name}: {elapsed:.3f}s for {number} loops")
+
+    crowd: list = [
+        adapt(Korean(), speak="speak_korean") if index % 3 else adapter
+        for index, adapter in enumerate(speakers * 500_000)
+    ]
+    collection: AdapterCollection = AdapterCollection(crowd)
+    assert collection.invoke("speak") == [speaker.speak() for speaker in crowd]
+    looped: float = timeit.timeit(
+        lambda: [speaker.speak() for speaker in crowd], number=1
+    )
+    grouped: float = timeit.timeit(lambda: collection.invoke("speak"), number=1)
+    print(
+        f"{len(crowd)} speakers: loop {looped:.3f}s, "
+        f"AdapterCollection {grouped:.3f}s"
+    )
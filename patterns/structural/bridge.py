@@ -1,4 +1,12 @@
+import mmap
+import struct
 from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 
 class DrawApi(ABC):
@@ -8,6 +16,13 @@ class DrawApi(ABC):
     def draw_circle(self, x: int, y: int, radius: int) -> None:
         pass
 
+    def draw_circles(self, circles: "CircleBatch") -> None:
+        """Draws a batch of circles one by one unless overridden."""
+        for x, y, radius in zip(
+            circles.x.tolist(), circles.y.tolist(), circles.radius.tolist()
+        ):
+            self.draw_circle(x, y, radius)
+
 
 class Circle(ABC):
     """Provides circle shape interface."""
@@ -35,6 +50,267 @@ class DrawApiTwo(DrawApi):
         print(f"API 2 drawing a circle at ({x}, {y} with radius {radius}!)")
 
 
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy package is required for batch drawing!")
+
+
+def _ring_bounds(radius: int) -> Tuple[int, int]:
+    """Bounds squared distances of pixels on a circle outline.
+
+    A pixel is on the outline if its distance is within half a pixel of
+    the radius, which in integers is `inner <= dx ** 2 + dy ** 2 <= outer`.
+    """
+    inner: int = radius * radius - radius + 1 if radius else 0
+    return inner, radius * radius + radius
+
+
+def _isqrt(value: Any) -> Any:
+    """Rounds down square roots of non-negative int64 numbers."""
+    root: Any = np.floor(np.sqrt(value)).astype(np.int64)
+    root -= root * root > value
+    root += (root + 1) * (root + 1) <= value
+    return root
+
+
+def _isqrt_int(value: int) -> int:
+    """Rounds down a square root of a non-negative Python integer."""
+    root: int = int(value**0.5)
+    while root * root > value:
+        root -= 1
+    while (root + 1) * (root + 1) <= value:
+        root += 1
+    return root
+
+
+class FramebufferDrawApi(DrawApi):
+    """Implementation-specific abstraction: rasterizes into a framebuffer.
+
+    Circle outlines are drawn for all circles of the same radius at once,
+    by broadcasting precomputed outline offsets over their centers. Rings
+    which cannot cross the frame are skipped, and those wider than the
+    frame are clipped to it column by column instead.
+    """
+
+    _chunk: int = 1 << 22
+
+    def __init__(self, width: int, height: int, frame: Any = None) -> None:
+        _require_numpy()
+        self._width: int = width
+        self._height: int = height
+        self._frame: Any = (
+            np.zeros((height, width), dtype=np.uint8)
+            if frame is None
+            else frame
+        )
+        self._outlines: Dict[int, Tuple[Any, Any]] = {}
+
+    @property
+    def frame(self) -> Any:
+        return self._frame
+
+    def _outline(self, radius: int) -> Tuple[Any, Any]:
+        """Computes outline offsets column by column, in O(radius)."""
+        try:
+            return self._outlines[radius]
+        except KeyError:
+            pass
+        inner, outer = _ring_bounds(radius)
+        dx: Any = np.arange(-radius, radius + 1, dtype=np.int64)
+        high: Any = _isqrt(outer - dx * dx)
+        rest: Any = np.maximum(inner - dx * dx, 0)
+        low: Any = _isqrt(rest)
+        low += low * low < rest
+        counts: Any = np.maximum(high - low + 1, 0)
+        starts: Any = np.repeat(np.cumsum(counts) - counts, counts)
+        dy: Any = np.repeat(low, counts) + np.arange(counts.sum()) - starts
+        dx = np.repeat(dx, counts)
+        mirrored: Any = dy > 0
+        outline: Tuple[Any, Any] = (
+            np.concatenate((dy, -dy[mirrored])),
+            np.concatenate((dx, dx[mirrored])),
+        )
+        self._outlines[radius] = outline
+        return outline
+
+    def _draw_clipped(self, x: int, y: int, radius: int) -> None:
+        """Draws a large outline over frame columns it crosses only."""
+        inner, outer = _ring_bounds(radius)
+        for column in range(
+            max(x - radius, 0), min(x + radius, self._width - 1) + 1
+        ):  # type: int
+            dx: int = column - x
+            high: int = _isqrt_int(outer - dx * dx)
+            rest: int = max(inner - dx * dx, 0)
+            low: int = _isqrt_int(rest)
+            low += low * low < rest
+            if low > high:
+                continue
+            for start, stop in ((y + low, y + high), (y - high, y - low)):
+                start, stop = max(start, 0), min(stop, self._height - 1)
+                if start <= stop:
+                    self._frame[start : stop + 1, column] = 255
+
+    def draw_circle(self, x: int, y: int, radius: int) -> None:
+        self.draw_circles(CircleBatch([x], [y], [radius], self))
+
+    def _visible(self, circles: "CircleBatch") -> Any:
+        """Selects circles whose outline may cross the frame.
+
+        Those of a negative radius have none, others are skipped if they
+        miss the frame or the whole frame lies inside them.
+        """
+        radii, xs, ys = circles.radius, circles.x, circles.y
+        reach: Any = np.hypot(
+            np.maximum(np.abs(xs), np.abs(xs - (self._width - 1))),
+            np.maximum(np.abs(ys), np.abs(ys - (self._height - 1))),
+        )
+        return (
+            (radii >= 0)
+            & (xs + radii >= 0)
+            & (xs - radii < self._width)
+            & (ys + radii >= 0)
+            & (ys - radii < self._height)
+            & (reach >= radii - 0.5)
+        )
+
+    def _draw_outlines(self, radii: Any, xs: Any, ys: Any) -> None:
+        """Draws circles of the same radius at once, by broadcasting."""
+        for radius in np.unique(radii).tolist():  # type: int
+            dy, dx = self._outline(radius)
+            selected: Any = radii == radius
+            centers_x: Any = xs[selected]
+            centers_y: Any = ys[selected]
+            step: int = max(1, self._chunk // dx.size)
+            for start in range(0, centers_x.size, step):  # type: int
+                rows: Any = centers_y[start : start + step, None] + dy
+                columns: Any = centers_x[start : start + step, None] + dx
+                inside: Any = (
+                    (rows >= 0)
+                    & (rows < self._height)
+                    & (columns >= 0)
+                    & (columns < self._width)
+                )
+                self._frame[rows[inside], columns[inside]] = 255
+
+    def draw_circles(self, circles: "CircleBatch") -> None:
+        """Draws outlines of circles which may cross the frame."""
+        visible: Any = self._visible(circles)
+        radii: Any = circles.radius[visible]
+        xs: Any = circles.x[visible]
+        ys: Any = circles.y[visible]
+        wide: Any = radii > max(self._width, self._height)
+        for x, y, radius in zip(
+            xs[wide].tolist(), ys[wide].tolist(), radii[wide].tolist()
+        ):
+            self._draw_clipped(x, y, radius)
+        self._draw_outlines(radii[~wide], xs[~wide], ys[~wide])
+
+
+class CommandStreamDrawApi(DrawApi):
+    """Implementation-specific abstraction: writes binary draw commands.
+
+    Every circle becomes a fixed-size record packed into a local buffer,
+    which is written to a stream once it grows over a given size.
+    """
+
+    circle: int = 1
+    record: struct.Struct = struct.Struct("<Biii")
+
+    def __init__(self, stream: BinaryIO, buffer_size: int = 1 << 16) -> None:
+        self._stream: BinaryIO = stream
+        self._buffer_size: int = buffer_size
+        self._buffer: bytearray = bytearray()
+
+    def __enter__(self) -> "CommandStreamDrawApi":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.flush()
+
+    def draw_circle(self, x: int, y: int, radius: int) -> None:
+        self._buffer += self.record.pack(self.circle, x, y, radius)
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def draw_circles(self, circles: "CircleBatch") -> None:
+        """Writes a whole batch, rejecting it like `draw_circle` would."""
+        limits: Any = np.iinfo(np.int32)
+        for values in (circles.x, circles.y, circles.radius):
+            if values.size and (
+                values.min() < limits.min or values.max() > limits.max
+            ):
+                raise struct.error(
+                    f"'i' format requires {limits.min} <= number <= "
+                    f"{limits.max}"
+                )
+        records: Any = np.empty(
+            len(circles),
+            dtype=[("op", "u1"), ("x", "<i4"), ("y", "<i4"), ("radius", "<i4")],
+        )
+        records["op"] = self.circle
+        records["x"] = circles.x
+        records["y"] = circles.y
+        records["radius"] = circles.radius
+        self.flush()
+        self._stream.write(records.tobytes())
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._stream.write(self._buffer)
+            self._buffer = bytearray()
+
+    @classmethod
+    def read_commands(
+        cls, stream: BinaryIO
+    ) -> Iterator[Tuple[int, int, int, int]]:
+        """Reads draw commands back from a stream."""
+        chunk_size: int = cls.record.size * 4096
+        while True:
+            chunk: bytes = stream.read(chunk_size)
+            if not chunk:
+                return
+            yield from cls.record.iter_unpack(chunk)
+
+
+class MappedImageDrawApi(FramebufferDrawApi):
+    """Implementation-specific abstraction: renders into an image file.
+
+    A binary PGM image is memory-mapped, so drawing writes pixels straight
+    into the page cache of that file instead of an in-memory framebuffer.
+    """
+
+    def __init__(self, path: str, width: int, height: int) -> None:
+        _require_numpy()
+        header: bytes = f"P5\n{width} {height}\n255\n".encode()
+        with open(path, "wb") as file:
+            file.write(header)
+            file.truncate(len(header) + width * height)
+        with open(path, "r+b") as file:
+            self._mapped: Optional[mmap.mmap] = mmap.mmap(file.fileno(), 0)
+        frame: Any = np.frombuffer(
+            self._mapped, dtype=np.uint8, offset=len(header)
+        ).reshape(height, width)
+        super().__init__(width, height, frame)
+
+    def __enter__(self) -> "MappedImageDrawApi":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        if self._mapped is not None:
+            self._mapped.flush()
+
+    def close(self) -> None:
+        if self._mapped is not None:
+            self.flush()
+            self._frame = None
+            self._mapped.close()
+            self._mapped = None
+
+
 class DrawCircle(Circle):
     """Implementation-independent abstraction: e.g there could be a rectangle class!."""
 
@@ -55,7 +331,94 @@ class DrawCircle(Circle):
         self._radius *= percentage
 
 
+class CircleBatch(Circle):
+    """Implementation-independent abstraction: a batch of circles.
+
+    Keeps copies of coordinates and radii in arrays, so a whole batch gets
+    scaled and drawn at once.
+    """
+
+    def __init__(self, x: Any, y: Any, radius: Any, draw_api: DrawApi) -> None:
+        _require_numpy()
+        self._x: Any = np.array(x, dtype=np.int64)
+        self._y: Any = np.array(y, dtype=np.int64)
+        self._radius: Any = np.array(radius, dtype=np.int64)
+        if not self._x.shape == self._y.shape == self._radius.shape:
+            raise ValueError("Circle coordinates and radii should match!")
+        self._draw_api: DrawApi = draw_api
+
+    def __len__(self) -> int:
+        return self._radius.size
+
+    @property
+    def x(self) -> Any:
+        return self._x
+
+    @property
+    def y(self) -> Any:
+        return self._y
+
+    @property
+    def radius(self) -> Any:
+        return self._radius
+
+    def draw(self) -> None:
+        self._draw_api.draw_circles(self)
+
+    def scale(self, percentage: int) -> None:
+        if not isinstance(percentage, int):
+            raise ValueError(
+                f'"{percentage}" value should be an integer data type!'
+            )
+        self._radius *= percentage
+
+
 circle_one: Circle = DrawCircle(1, 2, 3, DrawApiOne())
 circle_one.draw()
 circle_two: Circle = DrawCircle(3, 4, 6, DrawApiTwo())
 circle_two.draw()
+
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import os
+    import tempfile
+    import time
+
+    rng: Any = np.random.default_rng(0)
+    size: int = 1_000_000
+    centers: Any = rng.integers(0, 1024, size=(2, size))
+    radii: Any = rng.integers(1, 8, size=size)
+    arguments: list = list(
+        zip(centers[0].tolist(), centers[1].tolist(), radii.tolist())
+    )
+
+    def measure(name: str, api: DrawApi, batch: bool) -> None:
+        started: float = time.perf_counter()
+        if batch:
+            CircleBatch(centers[0], centers[1], radii, api).draw()
+        else:
+            for x, y, radius in arguments:
+                api.draw_circle(x, y, radius)
+        elapsed: float = time.perf_counter() - started
+        print(
+            f"{name}: {elapsed:.3f}s, {size / elapsed:,.0f} circles per second"
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        commands: str = os.path.join(directory, "circles.bin")
+        image: str = os.path.join(directory, "circles.pgm")
+        with contextlib.redirect_stdout(io.StringIO()):
+            started: float = time.perf_counter()
+            for x, y, radius in arguments:
+                DrawApiOne().draw_circle(x, y, radius)
+            printed: float = time.perf_counter() - started
+        print(f"DrawApiOne: {printed:.3f}s, {size / printed:,.0f} per second")
+        for batch in (False, True):  # type: bool
+            with open(commands, "wb") as stream:
+                with CommandStreamDrawApi(stream) as api:
+                    measure(f"CommandStreamDrawApi batch={batch}", api, batch)
+        measure("FramebufferDrawApi", FramebufferDrawApi(1024, 1024), True)
+        with MappedImageDrawApi(image, 1024, 1024) as mapped:
+            measure("MappedImageDrawApi", mapped, True)
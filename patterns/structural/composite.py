@@ -1,14 +1,96 @@
+# pylint:disable=protected-access
+import copy
+import os
 from abc import ABC, abstractmethod
-from typing import Sequence, List
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+
+class Aggregate(ABC):
+    """Abstract monoid folded over a subtree of components."""
+
+    @abstractmethod
+    def measure(self, component: "Component") -> Any:
+        """Returns a value of a single component."""
+        pass
+
+    @abstractmethod
+    def combine(self, one: Any, two: Any) -> Any:
+        pass
+
+
+class Sum(Aggregate):
+    """Sums up a measure of every component in a subtree."""
+
+    def __init__(self, measure: Callable[["Component"], Any]) -> None:
+        self._measure: Callable[["Component"], Any] = measure
+
+    def measure(self, component: "Component") -> Any:
+        return self._measure(component)
+
+    def combine(self, one: Any, two: Any) -> Any:
+        return one + two
 
 
 class Component(ABC):
     """Abstract interface of some component."""
 
+    __slots__ = ()
+    _parent: Optional["Composite"] = None
+
     @abstractmethod
     def function(self) -> None:
         pass
 
+    def children(self) -> Iterable["Component"]:
+        return ()
+
+    def size(self) -> int:
+        return self.aggregate(subtree_size)
+
+    def aggregate(self, aggregate: Aggregate) -> Any:
+        """Folds an aggregate over a subtree in depth-first order, uncached."""
+        nodes: Iterator[Component] = self.dfs()
+        value: Any = aggregate.measure(next(nodes))
+        for node in nodes:
+            value = aggregate.combine(value, aggregate.measure(node))
+        return value
+
+    def detached(self) -> "Component":
+        """Returns a shallow copy of a component without its tree links."""
+        component: Component = copy.copy(self)
+        getattr(component, "__dict__", {}).pop("_parent", None)
+        return component
+
+    def dfs(self) -> Iterator["Component"]:
+        """Traverses a tree depth-first with an explicit stack."""
+        stack: List[Component] = [self]
+        while stack:
+            node: Component = stack.pop()
+            yield node
+            stack.extend(reversed(tuple(node.children())))
+
+    def bfs(self) -> Iterator["Component"]:
+        """Traverses a tree breadth-first with an explicit queue."""
+        queue: Deque[Component] = deque((self,))
+        while queue:
+            node: Component = queue.popleft()
+            yield node
+            queue.extend(node.children())
+
 
 class Child(Component):
     """Concrete child component."""
@@ -24,25 +106,410 @@ class Child(Component):
 
 
 class Composite(Component):
-    """Concrete class maintains the tree recursive structure."""
+    """Concrete class maintains the tree recursive structure.
+
+    Children are kept in an insertion ordered dict, so a child is removed in
+    O(1). Subtree aggregates are cached and marked dirty up to the root on
+    every change below, so a repeated query costs O(1).
+    """
 
     def __init__(self, *args: str) -> None:
         self._args: Sequence[str] = args
-        self._children: List[Component] = []
+        self._children: Dict[Component, None] = {}
+        self._aggregates: Dict[Aggregate, Any] = {}
 
     def name(self) -> str:
         return self._args[0]
 
+    def children(self) -> Iterable[Component]:
+        return self._children
+
     def append_child(self, child: Component) -> None:
-        self._children.append(child)
+        node: Optional[Composite] = self
+        while node is not None:
+            if node is child:
+                raise ValueError(f"{child!r} is an ancestor component")
+            node = node._parent
+        if child._parent is not None and child._parent is not self:
+            child._parent.remove_child(child)
+        child._parent = self
+        self._children[child] = None
+        self._invalidate()
 
     def remove_child(self, child: Component) -> None:
-        self._children.remove(child)
+        try:
+            del self._children[child]
+        except KeyError:
+            raise ValueError(f"{child!r} is not a child component") from None
+        child._parent = None
+        self._invalidate()
+
+    def detached(self) -> "Component":
+        component: Any = super().detached()
+        component._children = {}
+        component._aggregates = {}
+        return component
+
+    def _invalidate(self) -> None:
+        node: Optional[Composite] = self
+        while node is not None and node._aggregates:
+            node._aggregates = {}
+            node = node._parent
+
+    def aggregate(self, aggregate: Aggregate) -> Any:
+        try:
+            return self._aggregates[aggregate]
+        except KeyError:
+            pass
+        stale: List[Composite] = []
+        stack: List[Composite] = [self]
+        while stack:
+            node: Composite = stack.pop()
+            stale.append(node)
+            stack.extend(
+                child
+                for child in node._children
+                if isinstance(child, Composite)
+                and aggregate not in child._aggregates
+            )
+        for node in reversed(stale):
+            value: Any = aggregate.measure(node)
+            for child in node._children:  # type: Component
+                value = aggregate.combine(value, child.aggregate(aggregate))
+            node._aggregates[aggregate] = value
+        return self._aggregates[aggregate]
 
     def function(self) -> None:
-        print(f'"{self.name()}" component')
-        for child in self._children:  # type: Component
-            child.function()
+        """Prints composites depth-first, other components print themselves."""
+        stack: List[Component] = [self]
+        while stack:
+            node: Any = stack.pop()
+            if type(node).function is Composite.function:
+                print(f'"{node.name()}" component')
+                stack.extend(reversed(tuple(node.children())))
+            else:
+                node.function()
+
+
+subtree_size: Aggregate = Sum(lambda component: 1)
+leaf_count: Aggregate = Sum(
+    lambda component: int(not isinstance(component, Composite))
+)
+
+_Encoded = Tuple[List[Component], List[int]]
+
+
+def _encode(component: Component) -> _Encoded:
+    """Flattens a subtree into detached nodes and their children counts.
+
+    Nodes are listed in post-order, so pickling a subtree never recurses.
+    """
+    nodes: List[Component] = []
+    counts: List[int] = []
+    stack: List[Component] = [component]
+    while stack:
+        node: Component = stack.pop()
+        children: Tuple[Component, ...] = tuple(node.children())
+        nodes.append(node.detached())
+        counts.append(len(children))
+        stack.extend(children)
+    nodes.reverse()
+    counts.reverse()
+    return nodes, counts
+
+
+def _process_encoded(
+    operation: Callable[[Component], Any],
+    combine: Callable[[Any, List[Any]], Any],
+    subtrees: List[_Encoded],
+) -> List[Any]:
+    """Processes flattened subtrees bottom-up within a worker process."""
+    results: List[Any] = []
+    for nodes, counts in subtrees:  # type: List[Component], List[int]
+        stack: List[Any] = []
+        for node, count in zip(nodes, counts):  # type: Component, int
+            values: List[Any] = stack[len(stack) - count :]
+            del stack[len(stack) - count :]
+            stack.append(combine(operation(node), values))
+        results.append(stack.pop())
+    return results
+
+
+def _partition(
+    component: Component, target: int
+) -> Tuple[List[Component], List[Component]]:
+    """Cuts a tree into subtrees not larger than a target size.
+
+    Returns nodes above the cuts in pre-order and the cut subtrees.
+    """
+    upper: List[Component] = []
+    cuts: List[Component] = []
+    stack: List[Component] = [component]
+    while stack:
+        node: Component = stack.pop()
+        children: Tuple[Component, ...] = tuple(node.children())
+        if node.size() <= target or not children:
+            cuts.append(node)
+        else:
+            upper.append(node)
+            stack.extend(children)
+    return upper, cuts
+
+
+def _pack(cuts: List[Component], target: int) -> List[List[Component]]:
+    """Packs subtrees largest first into bins of about a target size."""
+    bins: List[List[Component]] = []
+    filled: int = target
+    for cut in sorted(cuts, key=lambda cut: cut.size(), reverse=True):
+        if filled >= target:
+            bins.append([])
+            filled = 0
+        bins[-1].append(cut)
+        filled += cut.size()
+    return bins
+
+
+def process_in_parallel(
+    component: Component,
+    operation: Callable[[Component], Any],
+    combine: Callable[[Any, List[Any]], Any],
+    workers: Optional[int] = None,
+) -> Any:
+    """Processes a tree in a process pool and combines results bottom-up.
+
+    A tree is cut into subtrees by their cached sizes, which are packed
+    largest first into tasks of similar size, so unbalanced trees still keep
+    all workers busy. A picklable `operation` is called for every detached
+    node and `combine` folds its result with results of node children.
+    """
+    workers = workers or os.cpu_count() or 1
+    target: int = max(1, component.size() // (workers * 4))
+    upper, cuts = _partition(component, target)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: List[Tuple[List[Component], Future]] = [
+            (
+                group,
+                executor.submit(
+                    _process_encoded,
+                    operation,
+                    combine,
+                    [_encode(cut) for cut in group],
+                ),
+            )
+            for group in _pack(cuts, target)
+        ]
+        results: Dict[Component, Any] = {}
+        for group, future in futures:  # type: List[Component], Future
+            results.update(zip(group, future.result()))
+    for node in reversed(upper):  # type: Component
+        results[node] = combine(
+            operation(node.detached()),
+            [results[child] for child in node.children()],
+        )
+    return results[component]
+
+
+_no_node: int = -1
+
+
+class FlatTree:  # pylint:disable=too-many-instance-attributes
+    """Array-backed storage of a large component hierarchy.
+
+    Nodes are indices into parallel arrays of parent, first child, last
+    child and next sibling indices, while names are interned into ids, so a
+    node costs tens of bytes instead of a whole Python object.
+    """
+
+    def __init__(self) -> None:
+        self._parent: array = array("i")
+        self._first_child: array = array("i")
+        self._last_child: array = array("i")
+        self._next_sibling: array = array("i")
+        self._name_id: array = array("i")
+        self._composite: array = array("b")
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def _intern(self, name: str) -> int:
+        try:
+            return self._name_ids[name]
+        except KeyError:
+            self._name_ids[name] = len(self._names)
+            self._names.append(name)
+            return self._name_ids[name]
+
+    def _check_parent(self, parent: int) -> None:
+        if parent == _no_node:
+            return
+        if not 0 <= parent < len(self):
+            raise IndexError(f"{parent} node does not exist!")
+        if not self._composite[parent]:
+            raise ValueError(f'"{self.name(parent)}" is not a composite!')
+
+    def _link(self, parent: int, first: int, last: int) -> None:
+        if parent == _no_node:
+            return
+        if self._first_child[parent] == _no_node:
+            self._first_child[parent] = first
+        else:
+            self._next_sibling[self._last_child[parent]] = first
+        self._last_child[parent] = last
+
+    def add(
+        self, name: str, parent: int = _no_node, composite: bool = False
+    ) -> int:
+        """Appends a node to a parent and returns its index."""
+        return self.bulk_append(parent, (name,), composite)[0]
+
+    def bulk_append(
+        self, parent: int, names: Sequence[str], composite: bool = False
+    ) -> range:
+        """Appends many sibling nodes to a parent at once."""
+        self._check_parent(parent)
+        first: int = len(self)
+        count: int = len(names)
+        if not count:
+            return range(first, first)
+        self._parent.extend(array("i", (parent,)) * count)
+        self._first_child.extend(array("i", (_no_node,)) * count)
+        self._last_child.extend(array("i", (_no_node,)) * count)
+        self._next_sibling.extend(range(first + 1, first + count))
+        self._next_sibling.append(_no_node)
+        self._name_id.extend(map(self._intern, names))
+        self._composite.extend(array("b", (composite,)) * count)
+        self._link(parent, first, first + count - 1)
+        return range(first, first + count)
+
+    def remove(self, index: int) -> None:
+        """Unlinks a node and its subtree from its parent."""
+        parent: int = self._parent[index]
+        if parent == _no_node:
+            raise ValueError("A root node can not be removed!")
+        previous: int = _no_node
+        node: int = self._first_child[parent]
+        while node != index:
+            if node == _no_node:
+                raise ValueError(f"{index} is not a child of {parent}")
+            previous, node = node, self._next_sibling[node]
+        following: int = self._next_sibling[index]
+        if previous == _no_node:
+            self._first_child[parent] = following
+        else:
+            self._next_sibling[previous] = following
+        if self._last_child[parent] == index:
+            self._last_child[parent] = previous
+        self._parent[index] = _no_node
+        self._next_sibling[index] = _no_node
+
+    def name(self, index: int) -> str:
+        return self._names[self._name_id[index]]
+
+    def is_composite(self, index: int) -> bool:
+        return bool(self._composite[index])
+
+    def children(self, index: int) -> Iterator[int]:
+        node: int = self._first_child[index]
+        while node != _no_node:
+            yield node
+            node = self._next_sibling[node]
+
+    def dfs(self, index: int = 0) -> Iterator[int]:
+        """Traverses a subtree depth-first following sibling links."""
+        first_child: array = self._first_child
+        next_sibling: array = self._next_sibling
+        parent: array = self._parent
+        node: int = index
+        while True:
+            yield node
+            if first_child[node] != _no_node:
+                node = first_child[node]
+                continue
+            while node != index and next_sibling[node] == _no_node:
+                node = parent[node]
+            if node == index:
+                return
+            node = next_sibling[node]
+
+    def subtree_size(self, index: int = 0) -> int:
+        return sum(1 for _ in self.dfs(index))
+
+    def view(self, index: int = 0) -> "FlatNode":
+        return FlatNode(self, index)
+
+    @classmethod
+    def from_component(cls, component: Component) -> "FlatTree":
+        """Copies a tree of components into arrays."""
+        tree: FlatTree = cls()
+        tree.extend(_no_node, component)
+        return tree
+
+    def extend(self, parent: int, component: Component) -> int:
+        """Copies a component subtree under a parent node."""
+        root: int = _no_node
+        stack: List[Any] = [(parent, component)]
+        while stack:
+            owner, node = stack.pop()
+            index: int = self.add(
+                node.name(), owner, isinstance(node, Composite)
+            )
+            if root == _no_node:
+                root = index
+            stack.extend(
+                (index, child) for child in reversed(tuple(node.children()))
+            )
+        return root
+
+
+class FlatNode(Component):
+    """A thin view of a flat tree node."""
+
+    __slots__ = ("_tree", "_index", "_parent")
+
+    def __init__(self, tree: FlatTree, index: int) -> None:
+        self._tree: FlatTree = tree
+        self._index: int = index
+        self._parent: Optional[Composite] = None
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, FlatNode)
+            and self._tree is other._tree
+            and self._index == other._index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._tree), self._index))
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def detached(self) -> "FlatNode":
+        return FlatNode(self._tree, self._index)
+
+    def name(self) -> str:
+        return self._tree.name(self._index)
+
+    def children(self) -> Iterator["FlatNode"]:
+        for index in self._tree.children(self._index):  # type: int
+            yield FlatNode(self._tree, index)
+
+    def size(self) -> int:
+        return self._tree.subtree_size(self._index)
+
+    def append_child(self, child: Component) -> None:
+        self._tree.extend(self._index, child)
+
+    def remove_child(self, child: "FlatNode") -> None:
+        self._tree.remove(child.index)
+
+    def function(self) -> None:
+        tree: FlatTree = self._tree
+        for index in tree.dfs(self._index):  # type: int
+            print(f'"{tree.name(index)}" component')
 
 
 top_menu = Composite("top_menu")
@@ -57,3 +524,131 @@ submenu_two = Child("submenu two")
 top_menu.append_child(submenu_one)
 top_menu.append_child(submenu_two)
 top_menu.function()
+
+
+def _render(component: Any) -> int:
+    """Stands for a CPU-bound validation and rendering of a catalog node."""
+    digest: int = 0
+    for number in range(1_000):  # type: int
+        digest = hash((digest, number, component.name()))
+    return 1
+
+
+def _count(value: int, values: List[int]) -> int:
+    return value + sum(values)
+
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import sys
+    import time
+
+    def measure(name: str, callback: Any) -> None:
+        started: float = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            callback()
+        print(f"{name}: {time.perf_counter() - started:.3f}s")
+
+    deep: Composite = Composite("deep 0")
+    node: Composite = deep
+    for level in range(1, 100_000):  # type: int
+        child: Composite = Composite(f"deep {level}")
+        node.append_child(child)
+        node = child
+    print(f"deep tree of {deep.size()} nodes, {sys.getrecursionlimit()=}")
+    measure("deep function", deep.function)
+    measure("deep dfs", lambda: sum(1 for _ in deep.dfs()))
+    measure(
+        "deep size after a leaf change",
+        lambda: (node.append_child(Child("leaf")), deep.size()),
+    )
+
+    wide: Composite = Composite("wide")
+    leaves: List[Child] = [Child(f"leaf {index}") for index in range(1_000_000)]
+    for leaf in leaves:  # type: Child
+        wide.append_child(leaf)
+    measure("wide function", wide.function)
+    measure("wide bfs", lambda: sum(1 for _ in wide.bfs()))
+    measure("wide size", wide.size)
+    listed: List[Child] = list(leaves)
+    measure(
+        "wide list.remove x100",
+        lambda: [listed.remove(leaf) for leaf in leaves[-100:]],
+    )
+    measure(
+        "wide remove_child x100",
+        lambda: [wide.remove_child(leaf) for leaf in leaves[-100:]],
+    )
+
+    flat: FlatTree = FlatTree()
+    catalog: int = flat.add("catalog", composite=True)
+    started: float = time.perf_counter()
+    for section in flat.bulk_append(catalog, ["section"] * 1_000, True):
+        flat.bulk_append(section, ["item"] * 1_000)
+    print(
+        f"flat tree of {len(flat)} nodes built in "
+        f"{time.perf_counter() - started:.3f}s"
+    )
+    measure("flat dfs", lambda: sum(1 for _ in flat.dfs()))
+    measure("flat function", flat.view(catalog).function)
+
+    import random
+
+    weights: Dict[Component, int] = {}
+    total_weight: Aggregate = Sum(lambda component: weights.get(component, 0))
+    catalog_tree: Composite = Composite("catalog")
+    sections: List[Composite] = []
+    for section_number in range(1_000):  # type: int
+        section: Composite = Composite(f"section {section_number}")
+        for item_number in range(100):  # type: int
+            item: Child = Child(f"item {item_number}")
+            weights[item] = item_number
+            section.append_child(item)
+        catalog_tree.append_child(section)
+        sections.append(section)
+
+    def mixed_workload(query: Callable[[], Any]) -> None:
+        rng: random.Random = random.Random(0)
+        for operation in range(200):  # type: int
+            section = rng.choice(sections)
+            if operation % 2:
+                section.remove_child(next(iter(section.children())))
+            else:
+                added: Child = Child("added")
+                weights[added] = operation
+                section.append_child(added)
+            query()
+
+    measure(
+        "mixed workload with cached aggregates",
+        lambda: mixed_workload(lambda: catalog_tree.aggregate(total_weight)),
+    )
+    measure(
+        "mixed workload with full recompute",
+        lambda: mixed_workload(
+            lambda: sum(weights.get(node, 0) for node in catalog_tree.dfs())
+        ),
+    )
+
+    unbalanced: Composite = Composite("catalog")
+    for section_number, items in enumerate((20_000, 2_000, 200, 20, 2)):
+        section = Composite(f"section {section_number}")
+        for item_number in range(items):  # type: int
+            section.append_child(Child(f"item {item_number}"))
+        unbalanced.append_child(section)
+    for workers in (1, os.cpu_count() or 1):  # type: int
+        started = time.perf_counter()
+        processed: int = process_in_parallel(
+            unbalanced, _render, _count, workers
+        )
+        print(
+            f"{processed} nodes processed by {workers} workers in "
+            f"{time.perf_counter() - started:.3f}s"
+        )
+    started = time.perf_counter()
+    processed = _process_encoded(_render, _count, [_encode(unbalanced)])[0]
+    print(
+        f"{processed} nodes processed serially in "
+        f"{time.perf_counter() - started:.3f}s"
+    )
@@ -1,7 +1,27 @@
+import bisect
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Callable
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 from abc import ABC, abstractmethod
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 
 def make_blink(function: Callable[[str], str]) -> Callable[..., str]:
     """Defines the decorator function."""
@@ -25,6 +45,340 @@ print(hello_world.__name__)
 print(hello_world.__doc__)
 
 
+class CacheInfo(NamedTuple):
+    """Statistics of a memoized function cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    bytes: int
+
+
+_kwargs_mark: Tuple[object] = (object(),)
+
+
+class MemoCache:  # pylint:disable=too-many-instance-attributes
+    """A thread-safe memoization cache with pluggable eviction limits.
+
+    Entries are kept in least recently used order and evicted while any of
+    `maxsize`, `ttl` or `max_bytes` limits is exceeded. Expired entries are
+    swept on a write at most once per `ttl`, so they never outlive it twice.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ) -> None:
+        self._maxsize: Optional[int] = maxsize
+        self._ttl: Optional[float] = ttl
+        self._max_bytes: Optional[int] = max_bytes
+        self._sizeof: Callable[[Any], int] = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = (
+            OrderedDict()
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._bytes: int = 0
+        self._next_sweep: float = (
+            float("inf") if ttl is None else time.monotonic() + ttl
+        )
+
+    @staticmethod
+    def key(args: Tuple[Any, ...], kwargs: Any) -> Hashable:
+        if kwargs:
+            return args + _kwargs_mark + tuple(sorted(kwargs.items()))
+        return args
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns a found flag and a cached value of a key."""
+        with self._lock:
+            try:
+                value, expires, _ = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return False, None
+            if expires < time.monotonic():
+                self._evict(key)
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size: int = self._sizeof(value) if self._max_bytes is not None else 0
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        now: float = time.monotonic()
+        expires: float = float("inf") if self._ttl is None else now + self._ttl
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[2]
+            self._entries[key] = (value, expires, size)
+            self._bytes += size
+            while (
+                self._maxsize is not None and len(self._entries) > self._maxsize
+            ) or (
+                self._max_bytes is not None and self._bytes > self._max_bytes
+            ):
+                self._evict(next(iter(self._entries)))
+
+    def _sweep(self, now: float) -> None:
+        for key in [
+            key
+            for key, (_, expires, _) in self._entries.items()
+            if expires < now
+        ]:
+            self._evict(key)
+        self._next_sweep = now + (self._ttl or 0.0)
+
+    def _evict(self, key: Hashable) -> None:
+        self._bytes -= self._entries.pop(key)[2]
+        self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            try:
+                self._bytes -= self._entries.pop(key)[2]
+            except KeyError:
+                return False
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self._bytes,
+            )
+
+
+def memoize(cache: MemoCache) -> Callable[[Callable[..., Any]], Any]:
+    """Defines the decorator function memoizing results into a cache."""
+
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(function)
+        def memoized(*args, **kwargs) -> Any:
+            key: Hashable = cache.key(args, kwargs)
+            found, result = cache.get(key)
+            if not found:
+                result = function(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        def invalidate(*args, **kwargs) -> bool:
+            return cache.invalidate(cache.key(args, kwargs))
+
+        memoized.cache_info = cache.info  # type: ignore
+        memoized.cache_clear = cache.clear  # type: ignore
+        memoized.invalidate = invalidate  # type: ignore
+        return memoized
+
+    return decorator
+
+
+def memoize_lru(maxsize: int = 128) -> Callable[[Callable[..., Any]], Any]:
+    """Memoizes at most `maxsize` least recently used results."""
+    return memoize(MemoCache(maxsize=maxsize))
+
+
+def memoize_ttl(
+    ttl: float, maxsize: Optional[int] = None
+) -> Callable[[Callable[..., Any]], Any]:
+    """Memoizes results for `ttl` seconds."""
+    return memoize(MemoCache(maxsize=maxsize, ttl=ttl))
+
+
+def memoize_sized(
+    max_bytes: int, sizeof: Callable[[Any], int] = sys.getsizeof
+) -> Callable[[Callable[..., Any]], Any]:
+    """Memoizes results while their estimated size fits into `max_bytes`."""
+    return memoize(MemoCache(max_bytes=max_bytes, sizeof=sizeof))
+
+
+@memoize_lru(maxsize=2)
+def blink_world(name: str) -> str:
+    """Memoized function."""
+    return hello_world(name=name)
+
+
+print(blink_world(name="James"), blink_world(name="James"))
+print(blink_world.cache_info())
+
+
+_latency_bounds: Tuple[float, ...] = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+_latency_labels: Tuple[str, ...] = (
+    "1us",
+    "10us",
+    "100us",
+    "1ms",
+    "10ms",
+    "100ms",
+    "1s",
+    "inf",
+)
+
+
+class CallStats:
+    """Call count, cumulative time and latency histogram of a function.
+
+    Calls are counted without locking to keep hot paths cheap, only timed
+    samples are recorded under a lock. Cumulative time is extrapolated
+    from the samples when only 1-in-N calls are timed.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.calls: int = 0
+        self._sampled: int = 0
+        self._time: float = 0.0
+        self._histogram: List[int] = [0] * len(_latency_labels)
+        self._lock: threading.Lock = threading.Lock()
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self._sampled += 1
+            self._time += elapsed
+            self._histogram[bisect.bisect_left(_latency_bounds, elapsed)] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = self._sampled = 0
+            self._time = 0.0
+            self._histogram = [0] * len(_latency_labels)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            sampled, elapsed = self._sampled, self._time
+            histogram: List[int] = list(self._histogram)
+        mean: float = elapsed / sampled if sampled else 0.0
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "sampled": sampled,
+            "total": mean * self.calls,
+            "mean": mean,
+            "histogram": dict(zip(_latency_labels, histogram)),
+        }
+
+
+class ProfileRegistry:
+    """A process-wide registry of profiled functions."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, CallStats] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def stats(self, name: str) -> CallStats:
+        with self._lock:
+            if name not in self._stats:
+                self._stats[name] = CallStats(name)
+            return self._stats[name]
+
+    def reset(self) -> None:
+        with self._lock:
+            stats: List[CallStats] = list(self._stats.values())
+        for entry in stats:
+            entry.reset()
+
+    def report(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            stats: List[CallStats] = list(self._stats.values())
+        return sorted(
+            (entry.summary() for entry in stats),
+            key=lambda summary: summary["total"],
+            reverse=True,
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.report(), indent=2)
+
+    def to_table(self) -> str:
+        rows: List[str] = [
+            f"{'function':<40} {'calls':>10} {'sampled':>10} "
+            f"{'total s':>10} {'mean us':>10}  histogram"
+        ]
+        for summary in self.report():
+            histogram: str = " ".join(
+                f"<={label}:{count}"
+                for label, count in summary["histogram"].items()
+                if count
+            )
+            rows.append(
+                f"{summary['name']:<40} {summary['calls']:>10} "
+                f"{summary['sampled']:>10} {summary['total']:>10.6f} "
+                f"{summary['mean'] * 1e6:>10.2f}  {histogram}"
+            )
+        return "\n".join(rows)
+
+
+profiles: ProfileRegistry = ProfileRegistry()
+
+
+def profile(
+    function: Optional[Callable[..., Any]] = None,
+    *,
+    sample: int = 1,
+    registry: ProfileRegistry = profiles,
+) -> Any:
+    """Defines the decorator function timing 1-in-`sample` calls."""
+
+    if sample < 1:
+        raise ValueError(f"Sample rate should be positive, got {sample}!")
+
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        stats: CallStats = registry.stats(
+            f"{function.__module__}.{function.__qualname__}"
+        )
+        clock: Callable[[], float] = time.perf_counter
+
+        @wraps(function)
+        def profiled(*args, **kwargs) -> Any:
+            stats.calls += 1
+            if stats.calls % sample:
+                return function(*args, **kwargs)
+            started: float = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.record(clock() - started)
+
+        profiled.stats = stats  # type: ignore
+        return profiled
+
+    if function is None:
+        return decorator
+    return decorator(function)
+
+
+_demo_profiles: ProfileRegistry = ProfileRegistry()
+
+
+@profile(registry=_demo_profiles)
+def profiled_world(name: str) -> str:
+    """Profiled function, kept out of the process-wide registry."""
+    return hello_world(name=name)
+
+
+print(profiled_world(name="James"))
+print(_demo_profiles.to_table())
+
+
 class Number(ABC):
     """Abstraction of a number object."""
 
@@ -32,6 +386,10 @@ class Number(ABC):
     def value(self) -> int:
         pass
 
+    def expression(self, compiler: "NumberCompiler") -> str:
+        """Returns a source expression evaluating to a value of a number."""
+        return compiler.assign(f"{compiler.reference(self.value)}()")
+
 
 class Integer(Number):
     """A subclass of a number."""
@@ -42,6 +400,9 @@ class Integer(Number):
     def value(self) -> int:
         return self._value
 
+    def expression(self, compiler: "NumberCompiler") -> str:
+        return compiler.leaf(self._value)
+
 
 class Float(Number):
     """Decorator object converts `int` datatype into `float` datatype."""
@@ -52,6 +413,9 @@ class Float(Number):
     def value(self) -> float:
         return float(self._number.value())
 
+    def expression(self, compiler: "NumberCompiler") -> str:
+        return compiler.to_float(self._number.expression(compiler))
+
 
 class SumOfFloat(Number):
     """Sum of two `float` numbers."""
@@ -63,8 +427,122 @@ class SumOfFloat(Number):
     def value(self) -> float:
         return self._one.value() + self._two.value()
 
+    def expression(self, compiler: "NumberCompiler") -> str:
+        return compiler.assign(
+            f"{self._one.expression(compiler)}"
+            f" + {self._two.expression(compiler)}"
+        )
+
+
+class NumberCompiler:
+    """Flattens a decorator tree of numbers into a single function.
+
+    Every number contributes an assignment statement of one generated
+    function, so evaluation of a compiled tree costs one call instead of a
+    call per decorator, however deep the tree is. Vectorized compilers turn
+    `Integer` leaves into function parameters evaluated over whole arrays
+    with numpy.
+    """
+
+    def __init__(self, vectorized: bool = False) -> None:
+        if vectorized and np is None:
+            raise ImportError("numpy package is required for vectorizing!")
+        self._vectorized: bool = vectorized
+        self._namespace: Dict[str, Any] = {
+            "_float": _as_floats if vectorized else float
+        }
+        self._parameters: List[str] = []
+        self._statements: List[str] = []
+
+    def reference(self, obj: Any) -> str:
+        name: str = f"_ref{len(self._namespace)}"
+        self._namespace[name] = obj
+        return name
+
+    def leaf(self, value: int) -> str:
+        if not self._vectorized:
+            return self.reference(value)
+        name: str = f"_arg{len(self._parameters)}"
+        self._parameters.append(name)
+        return name
+
+    def assign(self, expression: str) -> str:
+        """Stores a value of an expression in a new local variable."""
+        name: str = f"_tmp{len(self._statements)}"
+        self._statements.append(f"    {name} = {expression}\n")
+        return name
+
+    def to_float(self, expression: str) -> str:
+        return self.assign(f"_float({expression})")
+
+    def compile(self, number: Number) -> Callable[..., Any]:
+        result: str = number.expression(self)
+        source: str = (
+            f"def _compiled({', '.join(self._parameters)}):\n"
+            f"{''.join(self._statements)}"
+            f"    return {result}\n"
+        )
+        exec(source, self._namespace)  # pylint:disable=exec-used
+        return self._namespace["_compiled"]
+
+
+def _as_floats(values: Any) -> Any:
+    return np.asarray(values, dtype=np.float64)
+
+
+def compile_number(number: Number) -> Callable[[], float]:
+    """Compiles a number into a function returning its value."""
+    return NumberCompiler().compile(number)
+
+
+def vectorize_number(number: Number) -> Callable[..., Any]:
+    """Compiles a number into a function evaluating it over arrays.
+
+    The function takes an array per `Integer` leaf, in order of appearance.
+    """
+    return NumberCompiler(vectorized=True).compile(number)
+
 
 integer_one: Number = Integer(value=5)
 integer_two: Number = Integer(value=6)
 sum_float: Number = SumOfFloat(integer_one, integer_two)
 print(sum_float.value())
+print(compile_number(sum_float)())
+
+
+if __name__ == "__main__":
+    import timeit
+
+    tree: Number = SumOfFloat(
+        SumOfFloat(Integer(1), Float(Integer(2))), Float(Integer(3))
+    )
+    flat: Callable[[], float] = compile_number(tree)
+    for name, evaluate in (("nested", tree.value), ("compiled", flat)):
+        elapsed: float = timeit.timeit(evaluate, number=1_000_000)
+        print(f"{name}: {elapsed:.3f}s per 1,000,000 evaluations")
+
+    size: int = 1_000_000
+    columns: List[Any] = [np.arange(size) + shift for shift in range(3)]
+    started: float = time.perf_counter()
+    nested: List[float] = [
+        SumOfFloat(
+            SumOfFloat(Integer(one), Float(Integer(two))), Float(Integer(three))
+        ).value()
+        for one, two, three in zip(*(column.tolist() for column in columns))
+    ]
+    print(f"nested objects: {time.perf_counter() - started:.3f}s")
+    started = time.perf_counter()
+    vectorized: Any = vectorize_number(tree)(*columns)
+    print(f"vectorized: {time.perf_counter() - started:.3f}s")
+    assert vectorized.tolist() == nested
+
+    def noop() -> None:
+        pass
+
+    for name, wrapped in (
+        ("plain", noop),
+        ("profiled", profile(noop)),
+        ("profiled 1-in-100", profile(noop, sample=100)),
+    ):
+        elapsed = timeit.timeit(wrapped, number=1_000_000)
+        print(f"{name}: {elapsed:.3f}s per 1,000,000 calls")
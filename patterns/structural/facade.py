@@ -1,6 +1,33 @@
+import asyncio
+import heapq
+import io
+import json
+import os
+import sys
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from enum import Enum
+from itertools import islice
 import time
-from typing import List, Tuple, Iterator, Type
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Iterator,
+    Type,
+)
 
 _sleep_for: float = 0.2
 
@@ -12,6 +39,10 @@ class TestCase(ABC):
     def run(self) -> None:
         pass
 
+    def timing_key(self) -> str:
+        """Returns a stable key of a test case to look up its timing."""
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
 
 class TestCaseOne(TestCase):
     """Concrete test case one."""
@@ -19,6 +50,9 @@ class TestCaseOne(TestCase):
     def __init__(self, name: str) -> None:
         self._name: str = name
 
+    def timing_key(self) -> str:
+        return f"{super().timing_key()}:{self._name}"
+
     def run(self) -> None:
         print("{:#^20}".format(self._name))
         time.sleep(_sleep_for)
@@ -37,6 +71,9 @@ class TestCaseTwo(TestCase):
     def __init__(self, name: str) -> None:
         self._name: str = name
 
+    def timing_key(self) -> str:
+        return f"{super().timing_key()}:{self._name}"
+
     def run(self) -> None:
         print("{:#^20}".format(self._name))
         time.sleep(_sleep_for)
@@ -55,6 +92,9 @@ class TestCaseThree(TestCase):
     def __init__(self, name: str) -> None:
         self._name: str = name
 
+    def timing_key(self) -> str:
+        return f"{super().timing_key()}:{self._name}"
+
     def run(self) -> None:
         print("{:#^20}".format(self._name))
         time.sleep(_sleep_for)
@@ -67,18 +107,248 @@ class TestCaseThree(TestCase):
         print("Test Finished\n")
 
 
+class _CapturedOutput(io.TextIOBase):
+    """Output stream writing into a buffer of a current context if any.
+
+    Every thread and every asyncio task has a context of its own.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self._stream: Any = stream
+        self._buffer: ContextVar[Optional[io.StringIO]] = ContextVar(
+            "buffer", default=None
+        )
+
+    def capture(self, buffer: Optional[io.StringIO]) -> None:
+        self._buffer.set(buffer)
+
+    def write(self, text: str) -> int:
+        buffer: Optional[io.StringIO] = self._buffer.get()
+        if buffer is None:
+            return self._stream.write(text)
+        return buffer.write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def _install_output() -> _CapturedOutput:
+    if not isinstance(sys.stdout, _CapturedOutput):
+        sys.stdout = _CapturedOutput(sys.stdout)
+    return sys.stdout
+
+
+_Result = Tuple[str, Optional[Exception], float]
+
+
+def _run_captured(testcase: TestCase) -> _Result:
+    """Runs a test case returning its output, an error and a duration."""
+    output: _CapturedOutput = _install_output()
+    buffer: io.StringIO = io.StringIO()
+    output.capture(buffer)
+    error: Optional[Exception] = None
+    started: float = time.perf_counter()
+    try:
+        testcase.run()
+    except Exception as failure:  # pylint:disable=broad-except
+        error = failure
+    finally:
+        output.capture(None)
+    return buffer.getvalue(), error, time.perf_counter() - started
+
+
+class TimingStore:
+    """Durations of test cases persisted into a JSON file.
+
+    Test cases never timed before are estimated to take `default` seconds.
+    """
+
+    def __init__(self, path: str, default: float = 1.0) -> None:
+        self._path: str = path
+        self._default: float = default
+        self._durations: Dict[str, float] = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                self._durations = json.load(file)
+
+    def estimate(self, name: str) -> float:
+        return self._durations.get(name, self._default)
+
+    def record(self, name: str, duration: float) -> None:
+        self._durations[name] = duration
+
+    def save(self) -> None:
+        temporary: str = f"{self._path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(self._durations, file, indent=2, sort_keys=True)
+        os.replace(temporary, self._path)
+
+
+class Schedule(NamedTuple):
+    """Longest-first order of test cases and their bins per worker."""
+
+    order: List[int]
+    bins: List[List[int]]
+    predicted: float
+
+
+def schedule(estimates: List[float], workers: int) -> Schedule:
+    """Packs test cases into workers, longest first onto the least loaded."""
+    order: List[int] = sorted(
+        range(len(estimates)), key=estimates.__getitem__, reverse=True
+    )
+    loads: List[Tuple[float, int]] = [
+        (0.0, worker) for worker in range(workers)
+    ]
+    bins: List[List[int]] = [[] for _ in range(workers)]
+    for index in order:
+        load, worker = heapq.heappop(loads)
+        bins[worker].append(index)
+        heapq.heappush(loads, (load + estimates[index], worker))
+    return Schedule(order, bins, max(load for load, _ in loads))
+
+
+class Makespan(NamedTuple):
+    """Predicted and actual wall time of a test suite run."""
+
+    predicted: Optional[float]
+    actual: float
+
+    def __str__(self) -> str:
+        predicted: str = (
+            "unknown" if self.predicted is None else f"{self.predicted:.3f}s"
+        )
+        return f"Makespan: predicted {predicted}, actual {self.actual:.3f}s"
+
+
 class TestSuite:
     """Represents simpler unified interface to run all test cases.
 
-    A facade class itself.
+    A facade class itself. With more than one worker test cases run on a
+    thread or a process pool, output of each test case is captured and
+    replayed in original order. A first failure in original order is
+    raised once all test cases finish. With `fail_fast` no more test cases
+    are started after a failure, only running ones are waited for.
+
+    Given a timing store test cases are started longest first, so that
+    workers finish at about the same time, and their durations are saved.
+    A single worker keeps the original order, since it finishes at the same
+    time in any order.
     """
 
-    def __init__(self, testcases: List[TestCase]) -> None:
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        testcases: List[TestCase],
+        workers: int = 1,
+        processes: bool = False,
+        fail_fast: bool = False,
+        timings: Optional[TimingStore] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"Workers should be positive, got {workers}!")
         self._testcases = testcases
-
-    def run(self) -> None:
-        for testcase in self._testcases:  # type: TestCase
-            testcase.run()
+        self._workers: int = workers
+        self._processes: bool = processes
+        self._fail_fast: bool = fail_fast
+        self._timings: Optional[TimingStore] = timings
+
+    def run(self) -> Makespan:
+        predicted: Optional[float] = None
+        order: List[int] = list(range(len(self._testcases)))
+        if self._timings is not None:
+            plan: Schedule = schedule(
+                [
+                    self._timings.estimate(testcase.timing_key())
+                    for testcase in self._testcases
+                ],
+                self._workers,
+            )
+            predicted = plan.predicted
+            if self._workers > 1:
+                order = plan.order
+        durations: Dict[int, float] = {}
+        started: float = time.perf_counter()
+        try:
+            if self._workers == 1:
+                self._run_sequential(order, durations)
+            else:
+                results: List[Optional[_Result]] = self._run_parallel(order)
+                durations.update(
+                    (index, result[2])
+                    for index, result in enumerate(results)
+                    if result is not None
+                )
+                self._replay(results)
+        finally:
+            self._save(durations)
+        return Makespan(predicted, time.perf_counter() - started)
+
+    def _run_sequential(
+        self, order: List[int], durations: Dict[int, float]
+    ) -> None:
+        for index in order:
+            started: float = time.perf_counter()
+            try:
+                self._testcases[index].run()
+            finally:
+                durations[index] = time.perf_counter() - started
+
+    def _save(self, durations: Dict[int, float]) -> None:
+        if self._timings is None:
+            return
+        for index, duration in durations.items():
+            self._timings.record(self._testcases[index].timing_key(), duration)
+        self._timings.save()
+
+    def _executor(self) -> Executor:
+        if self._processes:
+            return ProcessPoolExecutor(self._workers)
+        return ThreadPoolExecutor(self._workers)
+
+    def _run_parallel(self, order: List[int]) -> List[Optional[_Result]]:
+        results: List[Optional[_Result]] = [None] * len(self._testcases)
+        pending: Iterator[Tuple[int, TestCase]] = (
+            (index, self._testcases[index]) for index in order
+        )
+        failed: bool = False
+        stdout: Any = sys.stdout
+        _install_output()
+        try:
+            with self._executor() as executor:
+                running: Dict[Future, int] = {
+                    executor.submit(_run_captured, testcase): index
+                    for index, testcase in islice(pending, self._workers)
+                }
+                while running:
+                    done: Set[Future] = wait(
+                        running, return_when=FIRST_COMPLETED
+                    )[0]
+                    for future in done:
+                        index: int = running.pop(future)
+                        results[index] = future.result()
+                        failed |= results[index][1] is not None
+                    if failed and self._fail_fast:
+                        continue
+                    for index, testcase in islice(pending, len(done)):
+                        running[executor.submit(_run_captured, testcase)] = (
+                            index
+                        )
+        finally:
+            sys.stdout = stdout
+        return results
+
+    @staticmethod
+    def _replay(results: List[Optional[_Result]]) -> None:
+        failure: Optional[Exception] = None
+        for result in results:
+            if result is None:
+                continue
+            output, error, _ = result
+            sys.stdout.write(output)
+            if failure is None:
+                failure = error
+        if failure is not None:
+            raise failure
 
 
 test_cases: List[TestCase] = [
@@ -86,10 +356,119 @@ test_cases: List[TestCase] = [
     TestCaseTwo("TC2"),
     TestCaseThree("TC3"),
 ]
-test_suite = TestSuite(test_cases)
+test_suite = TestSuite(test_cases, workers=len(test_cases))
 test_suite.run()
 
 
+class AsyncTestCase(ABC):
+    """Abstract asynchronous test case interface."""
+
+    @abstractmethod
+    async def run(self) -> None:
+        pass
+
+
+class AsyncTestCaseOne(AsyncTestCase):
+    """Concrete asynchronous test case one."""
+
+    def __init__(self, name: str) -> None:
+        self._name: str = name
+
+    async def run(self) -> None:
+        print("{:#^20}".format(self._name))
+        await asyncio.sleep(_sleep_for)
+        print("Setting up testcase one")
+        await asyncio.sleep(_sleep_for)
+        print("Running test")
+        await asyncio.sleep(_sleep_for)
+        print("Tearing down")
+        await asyncio.sleep(_sleep_for)
+        print("Test Finished\n")
+
+
+class Status(Enum):
+    """Outcome of a test case."""
+
+    PASSED = "passed"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+
+
+class TestResult(NamedTuple):
+    """Structured result of a test case."""
+
+    testcase: AsyncTestCase
+    status: Status
+    duration: float
+    output: str
+    error: Optional[BaseException] = None
+
+
+class AsyncTestSuite:
+    """Represents unified interface to run asynchronous test cases.
+
+    Test cases run concurrently on one event loop, at most `concurrency` of
+    them at a time, each cancelled once it runs longer than `timeout`.
+    """
+
+    def __init__(
+        self,
+        testcases: List[AsyncTestCase],
+        concurrency: int = 100,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(
+                f"Concurrency should be positive, got {concurrency}!"
+            )
+        self._testcases = testcases
+        self._concurrency: int = concurrency
+        self._timeout: Optional[float] = timeout
+
+    async def run(self) -> List[TestResult]:
+        """Returns results of all test cases in original order."""
+        limit: asyncio.Semaphore = asyncio.Semaphore(self._concurrency)
+        stdout: Any = sys.stdout
+        output: _CapturedOutput = _install_output()
+        try:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._run_case(testcase, limit, output)
+                        for testcase in self._testcases
+                    )
+                )
+            )
+        finally:
+            sys.stdout = stdout
+
+    async def _run_case(
+        self,
+        testcase: AsyncTestCase,
+        limit: asyncio.Semaphore,
+        output: _CapturedOutput,
+    ) -> TestResult:
+        async with limit:
+            buffer: io.StringIO = io.StringIO()
+            output.capture(buffer)
+            status: Status = Status.PASSED
+            error: Optional[BaseException] = None
+            started: float = time.perf_counter()
+            try:
+                await asyncio.wait_for(testcase.run(), self._timeout)
+            except asyncio.TimeoutError as timeout:
+                status, error = Status.TIMEOUT, timeout
+            except Exception as failure:  # pylint:disable=broad-except
+                status, error = Status.FAILED, failure
+            return TestResult(
+                testcase,
+                status,
+                time.perf_counter() - started,
+                buffer.getvalue(),
+                error,
+            )
+
+
 class Interface(ABC):
     """Abstract interface."""
 
@@ -129,5 +508,42 @@ class Facade(Interface):
         yield from self._all
 
 
+class _SleepingTestCase(TestCase):
+    """Test case sleeping for a while."""
+
+    def __init__(self, name: str, sleep_for: float) -> None:
+        self._name: str = name
+        self._sleep_for: float = sleep_for
+
+    def timing_key(self) -> str:
+        return f"{super().timing_key()}:{self._name}"
+
+    def run(self) -> None:
+        time.sleep(self._sleep_for)
+
+
 if __name__ == "__main__":
+    import tempfile
+
+    async_results: List[TestResult] = asyncio.run(
+        AsyncTestSuite(
+            [AsyncTestCaseOne("ATC1"), AsyncTestCaseOne("ATC2")]
+        ).run()
+    )
+    for async_result in async_results:
+        print(async_result.output, end="")
+
     print(*(cls().run() for cls in Facade().run()))
+
+    sleeping: List[TestCase] = [
+        _SleepingTestCase(f"TC{index}", 0.1) for index in range(6)
+    ] + [_SleepingTestCase("TC6", 0.6)]
+    with tempfile.TemporaryDirectory() as directory:
+        store: TimingStore = TimingStore(
+            os.path.join(directory, "timings.json"), default=0.1
+        )
+        for attempt in ("cold", "warm"):
+            makespan: Makespan = TestSuite(
+                sleeping, workers=2, timings=store
+            ).run()
+            print(f"{attempt} {makespan}")
@@ -1,10 +1,45 @@
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import List, Dict, Iterator, Any
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from inspect import ismethod
+from itertools import chain, islice
+from typing import (
+    List,
+    Dict,
+    Callable,
+    Iterable,
+    Iterator,
+    Any,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+Listener = Callable[[Optional[List[str]]], None]
+
+
+def _listener_reference(listener: Listener) -> Callable[[], Optional[Listener]]:
+    """Refers to bound methods weakly, so owners of listeners can be dropped."""
+    if ismethod(listener):
+        return weakref.WeakMethod(listener)
+    return lambda: listener
 
 
 class Model(ABC):
     """Abstract model defines interfaces."""
 
+    _listeners: Tuple[Callable[[], Optional[Listener]], ...] = ()
+
     @abstractmethod
     def __iter__(self) -> Iterator[str]:
         pass
@@ -20,6 +55,53 @@ class Model(ABC):
     def item_type(self) -> str:
         pass
 
+    def find(self, item: str) -> Optional[Dict[str, Any]]:
+        """Returns information of an item or `None` if it does not exist."""
+        try:
+            return self.get(item)
+        except KeyError:
+            return None
+
+    def add_listener(self, listener: Listener) -> None:
+        """Subscribes to names of changed items, `None` stands for all.
+
+        Bound methods are held weakly and unsubscribe once their object
+        is gone, other callables stay until they are removed.
+        """
+        self._listeners += (_listener_reference(listener),)
+
+    def remove_listener(self, listener: Listener) -> None:
+        self._listeners = tuple(
+            reference
+            for reference in self._listeners
+            if reference() not in (listener, None)
+        )
+
+    def _changed(self, items: Optional[List[str]]) -> None:
+        alive: bool = True
+        for reference in self._listeners:
+            listener: Optional[Listener] = reference()
+            if listener is None:
+                alive = False
+            else:
+                listener(items)
+        if not alive:
+            self._listeners = tuple(
+                reference
+                for reference in self._listeners
+                if reference() is not None
+            )
+
+    def page(self, cursor: Any, size: int) -> Tuple[List[str], Any]:
+        """Returns at most `size` items after a cursor and a next cursor.
+
+        A `None` cursor starts from the first item, a `None` next cursor
+        means there are no more items. Cursors are offsets by default.
+        """
+        start: int = cursor or 0
+        items: List[str] = list(islice(self, start, start + size))
+        return items, start + size if len(items) == size else None
+
 
 class View(ABC):
     """Abstract view defines interfaces."""
@@ -42,6 +124,12 @@ class View(ABC):
     def item_not_found(self, item_type: str, item_name: str) -> None:
         pass
 
+    def show_item_pages(
+        self, item_type: str, pages: Iterable[List[str]]
+    ) -> None:
+        """Shows items pulled from pages one by one."""
+        self.show_item_list(item_type, chain.from_iterable(pages))
+
 
 class Controller(ABC):
     """Abstract controller defines interfaces."""
@@ -93,14 +181,241 @@ class ProductModel(Model):
             ) from error
 
 
+class SQLiteProductModel(Model):
+    """Concrete product model stored in a SQLite database.
+
+    Products are looked up through an index on their name, and threaded
+    controllers borrow connections from a small pool. Every connection
+    keeps its statements prepared, since SQL texts are constant. The default
+    database is a temporary file in WAL mode rather than a shared in-memory
+    cache, whose table locks would fail readers during a write.
+    """
+
+    _schema: Tuple[str, ...] = (
+        "CREATE TABLE IF NOT EXISTS products "
+        "(name TEXT NOT NULL, price REAL NOT NULL, quantity INTEGER NOT NULL)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS products_name ON products (name)",
+    )
+    _select: str = "SELECT price, quantity FROM products WHERE name = ?"
+    _select_page: str = (
+        "SELECT rowid, name FROM products WHERE rowid > ? "
+        "ORDER BY rowid LIMIT ?"
+    )
+    _insert: str = (
+        "INSERT OR REPLACE INTO products (name, price, quantity) "
+        "VALUES (?, ?, ?)"
+    )
+
+    def __init__(
+        self, database: str = ":memory:", pool_size: int = 4, page: int = 1024
+    ) -> None:
+        super().__init__()
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        if database == ":memory:":
+            # pylint:disable=consider-using-with
+            self._directory = tempfile.TemporaryDirectory()
+            database = os.path.join(self._directory.name, "products.db")
+        self._page: int = page
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(
+                sqlite3.connect(database, uri=True, check_same_thread=False)
+            )
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in self._schema:
+                connection.execute(statement)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection: sqlite3.Connection = self._pool.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self._pool.put(connection)
+
+    @property
+    def item_type(self) -> str:
+        return "product"
+
+    def load(self, products: Iterable[Tuple[str, float, int]]) -> None:
+        """Bulk loads name, price and quantity rows in one transaction.
+
+        Listeners are told that all items changed, rather than collecting
+        names of a bulk load.
+        """
+        with self._connection() as connection:
+            connection.executemany(self._insert, products)
+        self._changed(None)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yields names page by page, returning the connection in between."""
+        cursor: Any = None
+        while True:
+            names, cursor = self.page(cursor, self._page)
+            yield from names
+            if cursor is None:
+                return
+
+    def get(self, item: str) -> Dict[str, Any]:
+        info: Optional[Dict[str, Any]] = self.find(item)
+        if info is None:
+            raise KeyError(f"'{item}' not in the model's item list.")
+        return info
+
+    def find(self, item: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            row: Any = connection.execute(self._select, (item,)).fetchone()
+        if row is None:
+            return None
+        return {"price": ProductModel.Price(row[0]), "quantity": row[1]}
+
+    def page(self, cursor: Any, size: int) -> Tuple[List[str], Any]:
+        """Returns a page of items after a row id used as a cursor."""
+        with self._connection() as connection:
+            rows: List[Tuple[int, str]] = connection.execute(
+                self._select_page, (cursor or 0, size)
+            ).fetchall()
+        if len(rows) < size:
+            return [name for _, name in rows], None
+        return [name for _, name in rows], rows[-1][0]
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get().close()
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+
+_cent_suffixes: Tuple[str, ...] = tuple(f".{cents:02d}" for cents in range(100))
+
+
+def _format_cents(cents: Iterable[int]) -> List[str]:
+    """Formats prices with a lookup of cents instead of float rounding."""
+    return [
+        f"{dollars}{_cent_suffixes[rest]}"
+        for dollars, rest in (divmod(value, 100) for value in cents)
+    ]
+
+
+class ColumnarProductModel(Model):
+    """Concrete product model storing products in compact columns.
+
+    Rows are found through a name index, prices are kept as integer cents
+    and quantities as machine integers, instead of a dictionary per product.
+    Looked up prices are in dollars, as in the other product models.
+    """
+
+    class Price(ProductModel.Price):
+        """A price in dollars formatted through its integer cents."""
+
+        def __str__(self) -> str:
+            dollars, cents = divmod(round(self * 100), 100)
+            return f"{dollars}{_cent_suffixes[cents]}"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._prices: array = array("q")
+        self._quantities: array = array("i")
+
+    @property
+    def item_type(self) -> str:
+        return "product"
+
+    def load(self, products: Iterable[Tuple[str, float, int]]) -> None:
+        """Bulk loads name, price and quantity rows, replacing known names.
+
+        A row is converted into column types before any column changes, so
+        a rejected row leaves the columns as they were before it.
+        """
+        names: List[str] = []
+        try:
+            for name, price, quantity in products:
+                cents: int = round(price * 100)
+                if cents < 0:
+                    raise ValueError(f"Price of {name} should not be negative!")
+                cents = array(self._prices.typecode, (cents,))[0]
+                quantity = array(self._quantities.typecode, (quantity,))[0]
+                row: Optional[int] = self._rows.get(name)
+                if row is None:
+                    self._rows[name] = len(self._names)
+                    self._names.append(name)
+                    self._prices.append(cents)
+                    self._quantities.append(quantity)
+                else:
+                    self._prices[row] = cents
+                    self._quantities[row] = quantity
+                names.append(name)
+        finally:
+            self._changed(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def page(self, cursor: Any, size: int) -> Tuple[List[str], Any]:
+        start: int = cursor or 0
+        stop: int = start + size
+        return self._names[start:stop], stop if stop < len(self) else None
+
+    def get(self, item: str) -> Dict[str, Any]:
+        info: Optional[Dict[str, Any]] = self.find(item)
+        if info is None:
+            raise KeyError(f"'{item}' not in the model's item list.")
+        return info
+
+    def find(self, item: str) -> Optional[Dict[str, Any]]:
+        row: Optional[int] = self._rows.get(item)
+        if row is None:
+            return None
+        return {
+            "price": self.Price(self._prices[row] / 100),
+            "quantity": self._quantities[row],
+        }
+
+    def format_prices(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> List[str]:
+        """Formats prices of a range of rows at once."""
+        return _format_cents(self._prices[start:stop])
+
+
 class ConsoleView(View):
-    """Concrete console view."""
+    """Concrete console view.
+
+    Everything is written into a sink, standard output by default, and item
+    pages are written at once.
+    """
+
+    def __init__(self, sink: Optional[TextIO] = None) -> None:
+        self._sink: Optional[TextIO] = sink
+
+    def _output(self) -> TextIO:
+        return sys.stdout if self._sink is None else self._sink
 
     def show_item_list(self, item_type: str, item_list: Dict[str, Any]) -> None:
-        print("{} LIST:".format(item_type.upper()))
+        sink: TextIO = self._output()
+        print("{} LIST:".format(item_type.upper()), file=sink)
         for item in item_list:
-            print(item)
-        print("\n")
+            print(item, file=sink)
+        print("\n", file=sink)
+
+    def show_item_pages(
+        self, item_type: str, pages: Iterable[List[str]]
+    ) -> None:
+        sink: TextIO = self._output()
+        sink.write(f"{item_type.upper()} LIST:\n")
+        for page in pages:
+            if page:
+                sink.write("\n".join(page))
+                sink.write("\n")
+        sink.write("\n\n")
 
     @staticmethod
     def capitalizer(string: str) -> str:
@@ -109,41 +424,184 @@ class ConsoleView(View):
     def show_item_information(
         self, item_type: str, item_name: str, item_info: Dict[str, int]
     ) -> None:
-        print(f"{item_type.upper()} INFORMATION:")
+        sink: TextIO = self._output()
+        print(f"{item_type.upper()} INFORMATION:", file=sink)
         printout: str = f"Name: {item_name}"
         for key, value in item_info.items():
             printout += ", " + self.capitalizer(str(key)) + ": " + str(value)
         printout += "\n"
-        print(printout)
+        print(printout, file=sink)
 
     def item_not_found(self, item_type: str, item_name: str) -> None:
-        print(f'That "{item_type}" "{item_name}" does not exist in the records')
+        print(
+            f'That "{item_type}" "{item_name}" does not exist in the records',
+            file=self._output(),
+        )
 
 
-class ItemController(Controller):
-    """Concrete item controller."""
+class CacheStats(NamedTuple):
+    """Statistics of an item cache."""
+
+    hits: int
+    negative_hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ItemCache:
+    """A thread-safe least recently used cache of item information.
+
+    Items known to be missing are cached as `None`.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize: int = maxsize
+        self._items: "OrderedDict[str, Optional[Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self._hits: int = 0
+        self._negative_hits: int = 0
+        self._misses: int = 0
+        self._generation: int = 0
+
+    @property
+    def generation(self) -> int:
+        """Counts invalidations, to tell whether a lookup went stale."""
+        return self._generation
+
+    def get(self, item: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Returns a found flag and cached information of an item."""
+        with self._lock:
+            try:
+                info: Optional[Dict[str, Any]] = self._items[item]
+            except KeyError:
+                self._misses += 1
+                return False, None
+            self._items.move_to_end(item)
+            self._hits += 1
+            if info is None:
+                self._negative_hits += 1
+            return True, info
+
+    def put(
+        self,
+        item: str,
+        info: Optional[Dict[str, Any]],
+        generation: Optional[int] = None,
+    ) -> None:
+        """Caches information of an item unless it was invalidated since
+        the given generation."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._items[item] = info
+            self._items.move_to_end(item)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def invalidate(self, items: Optional[List[str]]) -> None:
+        """Drops changed items, or everything given `None`."""
+        with self._lock:
+            self._generation += 1
+            if items is None:
+                self._items.clear()
+                return
+            for item in items:
+                self._items.pop(item, None)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits, self._negative_hits, self._misses, len(self._items)
+            )
+
 
-    def __init__(self, item_model: Model, item_view: View) -> None:
+class ItemController(Controller):
+    """Concrete item controller.
+
+    Item information is read through a cache, which a model invalidates
+    when its items change.
+    """
+
+    def __init__(
+        self,
+        item_model: Model,
+        item_view: View,
+        page_size: int = 1000,
+        cache_size: int = 1024,
+    ) -> None:
         self._model = item_model
         self._view = item_view
+        self._page_size: int = page_size
+        self._cache: ItemCache = ItemCache(cache_size)
+        item_model.add_listener(self._cache.invalidate)
+
+    def pages(self) -> Iterator[List[str]]:
+        """Pulls items from a model lazily, one page at a time.
+
+        Models without their own `page` are paged over a single iteration,
+        rather than skipping past earlier items at every offset.
+        """
+        if type(self._model).page is Model.page:
+            items: Iterator[str] = iter(self._model)
+            page: List[str] = list(islice(items, self._page_size))
+            while page:
+                yield page
+                page = list(islice(items, self._page_size))
+            return
+        cursor: Any = None
+        while True:
+            items, cursor = self._model.page(cursor, self._page_size)
+            if items:
+                yield items
+            if cursor is None:
+                return
 
     def show_items(self) -> None:
-        items: List = list(self._model)
         item_type: str = self._model.item_type
-        self._view.show_item_list(item_type, items)
+        self._view.show_item_pages(item_type, self.pages())
 
     def show_item_information(self, item_name: str) -> None:
-        try:
-            item_info: Dict[str, Any] = self._model.get(item_name)
-        except KeyError:
-            item_type: str = self._model.item_type
+        found, item_info = self._cache.get(item_name)
+        if not found:
+            generation: int = self._cache.generation
+            item_info = self._model.find(item_name)
+            self._cache.put(item_name, item_info, generation)
+        item_type: str = self._model.item_type
+        if item_info is None:
             self._view.item_not_found(item_type, item_name)
         else:
-            item_type: str = self._model.item_type
             self._view.show_item_information(item_type, item_name, item_info)
 
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+def _benchmark_get(model: Model, names: List[str]) -> float:
+    started: float = time.perf_counter()
+    for name in names:
+        model.get(name)
+    return time.perf_counter() - started
+
+
+def _benchmark_iteration(model: Model) -> float:
+    started: float = time.perf_counter()
+    for _ in model:
+        pass
+    return time.perf_counter() - started
+
 
 if __name__ == "__main__":
+    import contextlib
+    import random
+    import tracemalloc
+
     model: Model = ProductModel()
     view: View = ConsoleView()
     controller: ItemController = ItemController(model, view)
@@ -153,6 +611,91 @@ if __name__ == "__main__":
     controller.show_item_information("milk")
     controller.show_item_information("arepas")
 
+    size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    catalog: SQLiteProductModel = SQLiteProductModel()
+    started: float = time.perf_counter()
+    catalog.load(
+        (f"product-{index}", index / 100, index % 100) for index in range(size)
+    )
+    print(f"load {size:,} products: {time.perf_counter() - started:.3f}s")
+    lookups: List[str] = [
+        f"product-{random.randrange(size)}" for _ in range(100_000)
+    ]
+    elapsed: float = _benchmark_get(catalog, lookups)
+    print(f"get: {len(lookups) / elapsed:,.0f} lookups per second")
+    elapsed = _benchmark_iteration(catalog)
+    print(f"iteration: {size / elapsed:,.0f} products per second")
+    with open(os.devnull, "w") as devnull:
+        tracemalloc.start()
+        started = time.perf_counter()
+        ItemController(catalog, ConsoleView(devnull)).show_items()
+        elapsed = time.perf_counter() - started
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(
+        f"show items: {size / elapsed:,.0f} products per second, "
+        f"{peak / 1024:,.0f} KiB peak"
+    )
+    requests: List[str] = [
+        (
+            f"product-{random.randrange(100)}"
+            if random.random() < 0.8
+            else f"missing-{random.randrange(1000)}"
+        )
+        for _ in range(100_000)
+    ]
+    for cache_size in (0, 1024):
+        cached: ItemController = ItemController(
+            catalog, ConsoleView(), cache_size=cache_size
+        )
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                for request in requests:
+                    cached.show_item_information(request)
+                elapsed = time.perf_counter() - started
+        print(
+            f"cache of {cache_size}: {len(requests) / elapsed:,.0f} "
+            f"requests per second, {cached.cache_stats().hit_ratio:.1%} hits"
+        )
+    catalog.close()
+
+    tracemalloc.start()
+    products: Dict[str, Dict[str, Any]] = {
+        f"product-{index}": {
+            "price": ProductModel.Price(index / 100),
+            "quantity": index % 100,
+        }
+        for index in range(size)
+    }
+    print(
+        f"dict memory: {tracemalloc.get_traced_memory()[0] / size:.0f} B/product"
+    )
+    tracemalloc.stop()
+    del products
+    columnar: ColumnarProductModel = ColumnarProductModel()
+    tracemalloc.start()
+    columnar.load(
+        (f"product-{index}", index / 100, index % 100) for index in range(size)
+    )
+    print(
+        f"columnar memory: {tracemalloc.get_traced_memory()[0] / size:.0f} B/product"
+    )
+    tracemalloc.stop()
+    elapsed = _benchmark_get(columnar, lookups)
+    print(f"columnar get: {len(lookups) / elapsed:,.0f} lookups per second")
+    prices: List[Any] = [
+        ProductModel.Price(columnar.get(name)["price"]) for name in columnar
+    ]
+    started = time.perf_counter()
+    rendered: List[str] = [str(price) for price in prices]
+    elapsed = time.perf_counter() - started
+    print(f"render Price: {size / elapsed:,.0f} prices per second")
+    started = time.perf_counter()
+    assert columnar.format_prices() == rendered
+    elapsed = time.perf_counter() - started
+    print(f"render columns: {size / elapsed:,.0f} prices per second")
+
 
 # OUTPUT #
 # PRODUCT LIST:
@@ -0,0 +1,265 @@
+# pylint:disable=protected-access
+from typing import Any, Dict, List
+import pytest
+from patterns.creational.prototype import (
+    Car,
+    Machine,
+    Prototype,
+    ClonePlan,
+    LazyClone,
+    CustomClonePlan,
+    DeepClonePlan,
+    FieldClonePlan,
+    clone_plan,
+    copy_value,
+    is_immutable,
+)
+from tests.marker import unittest
+
+pytestmark = unittest
+
+
+class Garage(Machine):
+    def __init__(self) -> None:
+        self._name: str = "Garage"
+        self._cars: List[Machine] = [Car(), Car()]
+        self._tires: Dict[str, List[str]] = {"winter": ["studded"]}
+        self._spare: List[Machine] = self._cars
+
+    def summary(self) -> str:
+        return f"Garage details: {self._name}"
+
+
+class Tuned(Car):
+    def __clone__(self) -> "Tuned":
+        tuned: Tuned = Tuned()
+        tuned._options = "Tuned"
+        return tuned
+
+
+class Defaulted(Car):
+    _color: str = "class-default"
+    _options: List[str] = []
+
+
+class Slotted(Machine):
+    __slots__ = ("_name",)
+
+    def __init__(self) -> None:
+        self._name: str = "Slotted"
+
+    def summary(self) -> str:
+        return self._name
+
+
+@pytest.fixture
+def prototype() -> Prototype:
+    prototype: Prototype = Prototype()
+    prototype.register_object("skylark", Car())
+    prototype.register_object("garage", Garage())
+    return prototype
+
+
+@pytest.mark.parametrize(
+    "value, result",
+    (
+        ("Red", True),
+        (None, True),
+        ((1, ("a", b"b")), True),
+        ((1, []), False),
+        ([], False),
+        ({}, False),
+    ),
+)
+def test_is_immutable(value: Any, result: bool) -> None:
+    assert is_immutable(value) is result
+
+
+@pytest.mark.parametrize(
+    "machine, plan",
+    (
+        (Car(), FieldClonePlan),
+        (Tuned(), CustomClonePlan),
+        (Slotted(), DeepClonePlan),
+    ),
+)
+def test_clone_plan(machine: Machine, plan: type) -> None:
+    assert isinstance(clone_plan(machine), plan)
+
+
+def test_clone_plan_shares_immutable_fields() -> None:
+    plan: ClonePlan = clone_plan(Garage())
+    assert isinstance(plan, FieldClonePlan)
+    assert plan.shared == frozenset(("_name",))
+
+
+def test_clone_plan_narrows_previous_plan() -> None:
+    car: Car = Car()
+    car._options = ["Ex"]
+    plan: ClonePlan = clone_plan(car, clone_plan(Car()))
+    assert isinstance(plan, FieldClonePlan)
+    assert plan.shared == frozenset(("_name", "_color"))
+
+
+class Price(float):
+    pass
+
+
+class Tags(list):
+    pass
+
+
+@pytest.mark.parametrize("value", (Price(5.5), Tags([1, [2]])))
+def test_copy_value_keeps_builtin_subclass_values(value: Any) -> None:
+    value.note = ["sale"]
+    result: Any = copy_value(value, {})
+    assert type(result) is type(value)
+    assert result == value
+    assert result.note == ["sale"]
+    assert result.note is not value.note
+
+
+def test_clone_plan_builtin_subclass() -> None:
+    class Priced(Price, Machine):
+        def summary(self) -> str:
+            return str(self)
+
+    assert isinstance(clone_plan(Priced(1.5)), DeepClonePlan)
+
+
+def test_copy_value_keeps_aliases() -> None:
+    shared: List[int] = [1]
+    original: Dict[str, List[int]] = {"one": shared, "two": shared}
+    result: Dict[str, List[int]] = copy_value(original, {})
+    assert result == original
+    assert result["one"] is not shared
+    assert result["one"] is result["two"]
+
+
+def test_clone_car(prototype: Prototype) -> None:
+    car: Machine = prototype.clone("skylark")
+    assert isinstance(car, Car)
+    assert car.summary() == "Car details: Skylar | Red | Ex"
+
+
+def test_clone_car_with_attributes(prototype: Prototype) -> None:
+    car: Machine = prototype.clone("skylark", _color="Blue")
+    assert car.summary() == "Car details: Skylar | Blue | Ex"
+
+
+def test_clone_nested_machine(prototype: Prototype) -> None:
+    garage: Any = prototype.clone("garage")
+    another: Any = prototype.clone("garage")
+    assert garage._cars is not another._cars
+    assert garage._cars[0] is not another._cars[0]
+    assert garage._tires["winter"] is not another._tires["winter"]
+    assert garage._spare is garage._cars
+
+
+def test_clone_custom_machine(prototype: Prototype) -> None:
+    prototype.register_object("tuned", Tuned())
+    assert prototype.clone("tuned").summary() == (
+        "Car details: Skylar | Red | Tuned"
+    )
+
+
+def test_clone_slotted_machine(prototype: Prototype) -> None:
+    slotted: Slotted = Slotted()
+    prototype.register_object("slotted", slotted)
+    clone: Machine = prototype.clone("slotted")
+    assert clone is not slotted
+    assert clone.summary() == "Slotted"
+
+
+def test_unregister_object(prototype: Prototype) -> None:
+    prototype.unregister_object("skylark")
+    with pytest.raises(KeyError):
+        prototype.clone("skylark")
+
+
+def test_clone_many(prototype: Prototype) -> None:
+    cars: List[Machine] = prototype.clone_many(
+        "skylark", ({"_color": color} for color in ("Blue", "Green"))
+    )
+    assert [car.summary() for car in cars] == [
+        "Car details: Skylar | Blue | Ex",
+        "Car details: Skylar | Green | Ex",
+    ]
+    assert cars[0] is not cars[1]
+
+
+def test_dump_and_load(prototype: Prototype, tmp_path: Any) -> None:
+    blob: Car = Car()
+    blob._options = bytearray(b"x" * 1024)
+    prototype.register_object("blob", blob)
+    snapshot: str = str(tmp_path / "prototype.snapshot")
+    prototype.dump(snapshot)
+    loaded: Prototype = Prototype.load(snapshot)
+    assert loaded.clone("skylark").summary() == (
+        "Car details: Skylar | Red | Ex"
+    )
+    assert loaded.clone("garage")._spare is not None
+    assert loaded.clone("blob")._options == bytearray(b"x" * 1024)
+
+
+def test_load_wrong_snapshot(tmp_path: Any) -> None:
+    snapshot: Any = tmp_path / "wrong.snapshot"
+    snapshot.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        Prototype.load(str(snapshot))
+
+
+def test_lazy_clone_reads_template(prototype: Prototype) -> None:
+    car: Machine = prototype.lazy_clone("skylark")
+    assert isinstance(car, Car)
+    assert isinstance(car, LazyClone)
+    assert car.summary() == "Car details: Skylar | Red | Ex"
+    assert not vars(car)
+
+
+def test_lazy_clone_overlays_attributes(prototype: Prototype) -> None:
+    car: Any = prototype.lazy_clone("skylark", _color="Blue")
+    car._options = "Sport"
+    assert car.summary() == "Car details: Skylar | Blue | Sport"
+    assert prototype.clone("skylark").summary() == (
+        "Car details: Skylar | Red | Ex"
+    )
+
+
+def test_lazy_clone_copies_on_access(prototype: Prototype) -> None:
+    garage: Any = prototype.lazy_clone("garage")
+    garage._tires["winter"].append("spiked")
+    assert garage._tires == {"winter": ["studded", "spiked"]}
+    assert prototype.clone("garage")._tires == {"winter": ["studded"]}
+
+
+def test_lazy_clone_keeps_aliases(prototype: Prototype) -> None:
+    garage: Any = prototype.lazy_clone("garage")
+    assert garage._spare is garage._cars
+    assert garage._cars is not prototype._elements["garage"]._cars
+
+
+def test_lazy_clone_missing_attribute(prototype: Prototype) -> None:
+    car: Machine = prototype.lazy_clone("skylark")
+    with pytest.raises(AttributeError):
+        getattr(car, "wheels")
+
+
+def test_lazy_clone_shadowed_class_attributes(prototype: Prototype) -> None:
+    template: Defaulted = Defaulted()
+    template._options = ["Ex"]
+    prototype.register_object("defaulted", template)
+    car: Any = prototype.lazy_clone("defaulted")
+    assert car._color == "Red"
+    car._options.append("Sport")
+    assert car._options == ["Ex", "Sport"]
+    assert template._options == ["Ex"]
+    car._color = "Blue"
+    assert car.summary() == "Car details: Skylar | Blue | ['Ex', 'Sport']"
+
+
+def test_lazy_clone_slotted_machine(prototype: Prototype) -> None:
+    prototype.register_object("slotted", Slotted())
+    slotted: Machine = prototype.lazy_clone("slotted")
+    assert not isinstance(slotted, LazyClone)
+    assert slotted.summary() == "Slotted"
@@ -0,0 +1,301 @@
+# pylint:disable=protected-access
+import asyncio
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List
+import pytest
+from patterns.creational.singleton import (
+    Borg,
+    BorgSingleton,
+    SharedBorg,
+    SharedState,
+    Singleton,
+    SingletonMeta,
+    context_singleton,
+    singleton,
+    singleton_scope,
+)
+from tests.marker import unittest
+
+pytestmark = unittest
+
+_threads: int = 16
+
+
+def _slow_meta() -> Any:
+    class Slow(metaclass=SingletonMeta):
+        def __init__(self) -> None:
+            time.sleep(0.01)
+
+    return Slow
+
+
+def _slow_new() -> Any:
+    class Slow(Singleton):
+        def __new__(cls) -> Any:
+            time.sleep(0.01)
+            return super().__new__(cls)
+
+    return Slow
+
+
+def _slow_decorated() -> Any:
+    class Slow:
+        def __init__(self) -> None:
+            time.sleep(0.01)
+
+    return singleton(Slow)
+
+
+@pytest.fixture
+def shared_state() -> Iterator[SharedState]:
+    state: SharedState = SharedState(slots=4, value_size=64)
+    yield state
+    state.close()
+    state.unlink()
+
+
+def _remember(acronym: str) -> None:
+    setattr(SharedBorg(), acronym, acronym.lower())
+
+
+def _first_access(factory: Callable[[], Any]) -> List[Any]:
+    barrier: threading.Barrier = threading.Barrier(_threads)
+
+    def access() -> Any:
+        barrier.wait()
+        return factory()
+
+    with ThreadPoolExecutor(max_workers=_threads) as executor:
+        futures: List[Any] = [executor.submit(access) for _ in range(_threads)]
+        return [future.result() for future in futures]
+
+
+def test_singleton_meta() -> None:
+    class Single(metaclass=SingletonMeta):
+        pass
+
+    assert Single() is Single()
+
+
+def test_singleton_new() -> None:
+    assert Singleton() is Singleton()
+
+
+def test_singleton_new_per_subclass() -> None:
+    class One(Singleton):
+        pass
+
+    class Two(One):
+        pass
+
+    assert One().__class__ is One
+    assert Two().__class__ is Two
+    assert One() is One()
+    assert Two() is not One()
+    assert Singleton() is not One()
+
+
+def test_singleton_decorator() -> None:
+    @singleton
+    class Bar:
+        pass
+
+    assert Bar() is Bar()
+
+
+@pytest.mark.parametrize(
+    "factory", (_slow_meta(), _slow_new(), _slow_decorated())
+)
+def test_concurrent_first_access(factory: Callable[[], Any]) -> None:
+    instances: List[Any] = _first_access(factory)
+    assert instances[0].__class__.__name__ == "Slow"
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_borg_shares_state() -> None:
+    one: Borg = BorgSingleton(FTP="File Transfer Protocol")
+    two: Borg = BorgSingleton()
+    assert one is not two
+    assert vars(one) is vars(two)
+    assert "FTP" in str(two)
+
+
+def test_async_singleton_shares_initialization() -> None:
+    created: List[Any] = []
+
+    @singleton
+    class Pool:
+        def __init__(self) -> None:
+            created.append(self)
+
+        async def __ainit__(self) -> None:
+            await asyncio.sleep(0.01)
+
+    async def burst() -> List[Any]:
+        return await asyncio.gather(*(Pool() for _ in range(10)))
+
+    pools: List[Any] = asyncio.run(burst())
+    assert all(pool is pools[0] for pool in pools)
+    assert asyncio.run(Pool()) is pools[0]
+    assert created == [pools[0]]
+
+
+def test_async_singleton_retries_failed_initialization() -> None:
+    attempts: List[int] = []
+
+    @singleton
+    class Pool:
+        async def __ainit__(self) -> None:
+            attempts.append(len(attempts))
+            await asyncio.sleep(0)
+            if len(attempts) == 1:
+                raise ConnectionError("service is not ready")
+
+    async def burst() -> List[Any]:
+        return await asyncio.gather(
+            *(Pool() for _ in range(5)), return_exceptions=True
+        )
+
+    failures: List[Any] = asyncio.run(burst())
+    assert all(isinstance(error, ConnectionError) for error in failures)
+    pool: Any = asyncio.run(Pool())
+    assert asyncio.run(Pool()) is pool
+    assert attempts == [0, 1]
+
+
+def test_shared_state(shared_state: SharedState) -> None:
+    shared_state["HTTP"] = "Hyper Text Transfer Protocol"
+    shared_state["HTTP"] = "HyperText Transfer Protocol"
+    shared_state["PORTS"] = [80, 443]
+    assert shared_state["HTTP"] == "HyperText Transfer Protocol"
+    assert "PORTS" in shared_state
+    assert "FTP" not in shared_state
+    assert dict(shared_state.items()) == {
+        "HTTP": "HyperText Transfer Protocol",
+        "PORTS": [80, 443],
+    }
+
+
+@pytest.mark.parametrize("key, value", (("K" * 33, "value"), ("KEY", "V" * 64)))
+def test_shared_state_limits(
+    shared_state: SharedState, key: str, value: str
+) -> None:
+    with pytest.raises(ValueError):
+        shared_state[key] = value
+
+
+def test_shared_state_is_full(shared_state: SharedState) -> None:
+    for key in ("A", "B", "C", "D"):
+        shared_state[key] = key
+    with pytest.raises(ValueError):
+        shared_state["E"] = "E"
+
+
+def test_shared_state_stuck_update(shared_state: SharedState) -> None:
+    shared_state["HTTP"] = "http"
+    buffer: Any = shared_state._memory.buf
+    for offset in range(0, len(buffer), shared_state._stride):
+        buffer[offset] |= 1
+    shared_state._read_timeout = 0.05
+    started: float = time.monotonic()
+    with pytest.raises(TimeoutError):
+        assert "HTTP" in shared_state
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires fork")
+def test_shared_borg_across_processes(shared_state: SharedState) -> None:
+    SharedBorg.share(shared_state)
+    SharedBorg(HTTP="http")
+    process: Any = multiprocessing.get_context("fork").Process(
+        target=_remember, args=("FTP",)
+    )
+    process.start()
+    process.join()
+    borg: Any = SharedBorg()
+    assert borg.FTP == "ftp"
+    assert borg.HTTP == "http"
+    with pytest.raises(AttributeError):
+        getattr(borg, "SNMP")
+
+
+def test_context_singleton_per_thread() -> None:
+    @context_singleton
+    class Buffer:
+        pass
+
+    barrier: threading.Barrier = threading.Barrier(2)
+
+    def access() -> List[Any]:
+        barrier.wait()
+        return [Buffer(), Buffer()]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        one, two = executor.submit(access), executor.submit(access)
+        instances: List[Any] = one.result() + two.result()
+    assert instances[0] is instances[1]
+    assert instances[2] is instances[3]
+    assert instances[0] is not instances[2]
+
+
+def test_context_singleton_per_task() -> None:
+    @context_singleton
+    class Buffer:
+        pass
+
+    async def access() -> List[Any]:
+        first: Any = Buffer()
+        await asyncio.sleep(0)
+        return [first, Buffer()]
+
+    async def burst() -> List[List[Any]]:
+        return await asyncio.gather(access(), access())
+
+    one, two = asyncio.run(burst())
+    assert one[0] is one[1]
+    assert two[0] is two[1]
+    assert one[0] is not two[0]
+
+
+def test_context_singleton_per_child_task() -> None:
+    @context_singleton
+    class Buffer:
+        pass
+
+    async def access() -> Any:
+        await asyncio.sleep(0)
+        return Buffer()
+
+    async def burst() -> List[Any]:
+        parent: Any = Buffer()
+        children: List[Any] = await asyncio.gather(access(), access())
+        return [parent, Buffer()] + children
+
+    parent, again, one, two = asyncio.run(burst())
+    assert parent is again
+    assert one is not parent
+    assert two is not parent
+    assert one is not two
+
+
+def test_singleton_scope_releases_instances() -> None:
+    released: List[Any] = []
+
+    @context_singleton(release=released.append)
+    class Buffer:
+        pass
+
+    def scoped() -> List[Any]:
+        with singleton_scope():
+            instance: Any = Buffer()
+            assert Buffer() is instance
+        return [instance, Buffer()]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        instance, another = executor.submit(scoped).result()
+    assert released == [instance]
+    assert another is not instance
@@ -0,0 +1,137 @@
+# pylint:disable=protected-access
+from typing import Any
+import pytest
+from patterns.structural.adapter import (
+    Adapter,
+    AdapterCollection,
+    British,
+    Korean,
+    adapt,
+    adapter_class,
+)
+from tests.marker import unittest
+
+pytestmark = unittest
+
+
+class Robot:
+    def __init__(self) -> None:
+        self.model: str = "R2"
+
+    def beep(self, times: int, tone: str = "high") -> str:
+        return f"{tone} beep x{times}"
+
+    def greet(self, name: str) -> str:
+        return f"Hello {name}"
+
+
+@pytest.fixture(scope="module")
+def korean() -> Adapter:
+    return adapt(Korean(), speak="speak_korean")
+
+
+def test_adapter() -> None:
+    british: British = British()
+    speaker: Any = Adapter(british, speak=british.speak_english)
+    assert speaker.type() == "British"
+    assert speaker.speak() == "Hello"
+
+
+def test_adapt(korean: Any) -> None:
+    assert isinstance(korean, Adapter)
+    assert korean.type() == "Korean"
+    assert korean.speak() == "An-neyong?"
+    assert korean.speak_korean() == "An-neyong?"
+
+
+def test_adapter_class_is_cached() -> None:
+    assert adapter_class(Korean, speak="speak_korean") is adapter_class(
+        Korean, speak="speak_korean"
+    )
+    assert adapter_class(Korean) is not adapter_class(
+        Korean, speak="speak_korean"
+    )
+
+
+def test_adapt_forwards_arguments() -> None:
+    robot: Any = adapt(Robot(), talk="greet", sound="beep")
+    assert robot.talk("Luke") == "Hello Luke"
+    assert robot.talk(name="Leia") == "Hello Leia"
+    assert robot.sound(2) == "high beep x2"
+    assert robot.sound(3, tone="low") == "low beep x3"
+
+
+def test_adapt_forwards_attributes() -> None:
+    robot: Any = adapt(Robot())
+    assert robot.model == "R2"
+    assert robot._object.model == "R2"
+
+
+def test_adapter_target(korean: Any) -> None:
+    british: British = British()
+    assert korean._adapter_target("speak") == "speak_korean"
+    adapter: Adapter = Adapter(british, speak=british.speak_english)
+    assert adapter._adapter_target("speak") == "speak_english"
+    assert Adapter(british, speak=str)._adapter_target("speak") is None
+
+
+class Archer:
+    def target(self) -> str:
+        return "bullseye"
+
+    def adaptee(self) -> str:
+        return "archer"
+
+
+def test_adapter_collection_adaptee_named_like_internals() -> None:
+    archer: Archer = Archer()
+    collection: AdapterCollection = AdapterCollection(
+        [
+            adapt(archer, talk="target"),
+            Adapter(archer, talk=archer.target, adaptee=archer.adaptee),
+            adapt(archer, talk="target"),
+        ]
+    )
+    assert collection.invoke("talk") == ["bullseye"] * 3
+    assert collection.invoke("adaptee") == ["archer"] * 3
+
+
+def test_adapter_collection() -> None:
+    korean: Korean = Korean()
+    british: British = British()
+    collection: AdapterCollection = AdapterCollection(
+        [
+            adapt(korean, speak="speak_korean"),
+            Adapter(british, speak=british.speak_english),
+            Adapter(korean, speak=korean.speak_korean),
+            adapt(korean, speak="speak_korean"),
+        ]
+    )
+    assert len(collection) == 4
+    assert collection.invoke("speak") == [
+        "An-neyong?",
+        "Hello",
+        "An-neyong?",
+        "An-neyong?",
+    ]
+    assert collection.invoke("type") == [
+        "Korean",
+        "British",
+        "Korean",
+        "Korean",
+    ]
+
+
+def test_adapter_collection_forwards_arguments() -> None:
+    collection: AdapterCollection = AdapterCollection(
+        [
+            adapt(Robot(), speak="greet"),
+            Adapter(British(), speak=lambda name: f"Hi {name}"),
+            adapt(Robot(), speak="greet"),
+        ]
+    )
+    assert collection.invoke("speak", "Han") == [
+        "Hello Han",
+        "Hi Han",
+        "Hello Han",
+    ]
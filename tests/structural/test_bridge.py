@@ -0,0 +1,152 @@
+import io
+import struct
+from typing import Any
+import pytest
+from patterns.structural.bridge import (
+    CircleBatch,
+    CommandStreamDrawApi,
+    DrawApiOne,
+    DrawCircle,
+    FramebufferDrawApi,
+    MappedImageDrawApi,
+)
+from tests.marker import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+pytestmark = unittest
+requires_numpy: Any = pytest.mark.skipif(np is None, reason="requires numpy")
+
+
+def test_draw_circle(capsys: Any) -> None:
+    DrawCircle(1, 2, 3, DrawApiOne()).draw()
+    assert capsys.readouterr().out == (
+        "API 1 drawing a circle at (1, 2 with radius 3!)\n"
+    )
+
+
+@requires_numpy
+def test_draw_circles_one_by_one(capsys: Any) -> None:
+    CircleBatch([1, 5], [2, 6], [3, 7], DrawApiOne()).draw()
+    assert capsys.readouterr().out.splitlines() == [
+        "API 1 drawing a circle at (1, 2 with radius 3!)",
+        "API 1 drawing a circle at (5, 6 with radius 7!)",
+    ]
+
+
+@requires_numpy
+def test_circle_batch_scale() -> None:
+    batch: CircleBatch = CircleBatch([1, 5], [2, 6], [3, 7], DrawApiOne())
+    batch.scale(2)
+    assert batch.radius.tolist() == [6, 14]
+    radii: Any = np.array([1, 2, 3])
+    CircleBatch([0, 0, 0], [0, 0, 0], radii, DrawApiOne()).scale(5)
+    assert radii.tolist() == [1, 2, 3]
+    with pytest.raises(ValueError):
+        batch.scale(1.5)  # type: ignore
+
+
+@requires_numpy
+def test_circle_batch_shape() -> None:
+    with pytest.raises(ValueError):
+        CircleBatch([1, 5], [2], [3, 7], DrawApiOne())
+
+
+def _outline(x: int, y: int, radius: int, width: int, height: int) -> Any:
+    return {
+        (row, column)
+        for row in range(height)
+        for column in range(width)
+        if abs(((row - y) ** 2 + (column - x) ** 2) ** 0.5 - radius) < 0.5
+    }
+
+
+@requires_numpy
+def test_framebuffer_draw_circles() -> None:
+    api: FramebufferDrawApi = FramebufferDrawApi(16, 8)
+    CircleBatch([2, 10, 15, 4], [2, 4, 0, 5], [1, 2, 2, 2], api).draw()
+    expected: Any = (
+        _outline(2, 2, 1, 16, 8)
+        | _outline(10, 4, 2, 16, 8)
+        | _outline(15, 0, 2, 16, 8)
+        | _outline(4, 5, 2, 16, 8)
+    )
+    assert set(map(tuple, np.argwhere(api.frame).tolist())) == expected
+    assert set(np.unique(api.frame).tolist()) == {0, 255}
+
+
+@requires_numpy
+def test_framebuffer_draws_large_circles() -> None:
+    api: FramebufferDrawApi = FramebufferDrawApi(16, 8)
+    CircleBatch([1003, 8], [4, 4], [1000, 10**12], api).draw()
+    assert set(map(tuple, np.argwhere(api.frame).tolist())) == _outline(
+        1003, 4, 1000, 16, 8
+    )
+
+
+@requires_numpy
+def test_framebuffer_skips_negative_radius() -> None:
+    api: FramebufferDrawApi = FramebufferDrawApi(8, 8)
+    batch: CircleBatch = CircleBatch([3, 5], [3, 5], [1, 0], api)
+    batch.scale(-1)
+    batch.draw()
+    assert np.argwhere(api.frame).tolist() == [[5, 5]]
+
+
+@requires_numpy
+def test_framebuffer_draw_circle() -> None:
+    api: FramebufferDrawApi = FramebufferDrawApi(8, 8)
+    api.draw_circle(3, 3, 1)
+    assert np.argwhere(api.frame).tolist() == [
+        [2, 2],
+        [2, 3],
+        [2, 4],
+        [3, 2],
+        [3, 4],
+        [4, 2],
+        [4, 3],
+        [4, 4],
+    ]
+
+
+@requires_numpy
+def test_command_stream_draw_api() -> None:
+    stream: io.BytesIO = io.BytesIO()
+    with CommandStreamDrawApi(stream, buffer_size=26) as api:
+        DrawCircle(1, 2, 3, api).draw()
+        assert not stream.getvalue()
+        CircleBatch([4, 7], [5, 8], [6, 9], api).draw()
+        DrawCircle(-1, -2, 3, api).draw()
+    stream.seek(0)
+    assert list(CommandStreamDrawApi.read_commands(stream)) == [
+        (1, 1, 2, 3),
+        (1, 4, 5, 6),
+        (1, 7, 8, 9),
+        (1, -1, -2, 3),
+    ]
+
+
+@requires_numpy
+@pytest.mark.parametrize("x, radius", ((2**31, 1), (0, -(2**31) - 1)))
+def test_command_stream_rejects_out_of_range(x: int, radius: int) -> None:
+    stream: io.BytesIO = io.BytesIO()
+    api: CommandStreamDrawApi = CommandStreamDrawApi(stream)
+    with pytest.raises(struct.error):
+        api.draw_circle(x, 0, radius)
+    with pytest.raises(struct.error):
+        CircleBatch([0, x], [0, 0], [1, radius], api).draw()
+    assert not stream.getvalue()
+
+
+@requires_numpy
+def test_mapped_image_draw_api(tmp_path: Any) -> None:
+    path: Any = tmp_path / "circles.pgm"
+    with MappedImageDrawApi(str(path), 8, 4) as api:
+        api.draw_circle(3, 1, 1)
+        expected: Any = api.frame.tobytes()
+    content: bytes = path.read_bytes()
+    assert content == b"P5\n8 4\n255\n" + expected
+    assert content.count(255) == 8
@@ -0,0 +1,271 @@
+from typing import Any, List
+import pytest
+from patterns.structural.composite import (
+    Aggregate,
+    Child,
+    Component,
+    Composite,
+    FlatNode,
+    FlatTree,
+    Sum,
+    leaf_count,
+    process_in_parallel,
+    subtree_size,
+)
+from tests.marker import unittest
+
+pytestmark = unittest
+
+
+def _names(components: Any) -> List[str]:
+    return [component.name() for component in components]
+
+
+def _name(component: Any) -> List[str]:
+    return [component.name()]
+
+
+def _concatenate(value: List[str], values: List[List[str]]) -> List[str]:
+    for names in values:
+        value.extend(names)
+    return value
+
+
+@pytest.fixture
+def menu() -> Composite:
+    menu: Composite = Composite("top_menu")
+    submenu: Composite = Composite("submenu one")
+    submenu.append_child(Child("sub_submenu one"))
+    submenu.append_child(Child("sub_submenu two"))
+    menu.append_child(submenu)
+    menu.append_child(Child("submenu two"))
+    return menu
+
+
+def test_function(menu: Composite, capsys: Any) -> None:
+    menu.function()
+    assert capsys.readouterr().out.splitlines() == [
+        '"top_menu" component',
+        '"submenu one" component',
+        '"sub_submenu one" component',
+        '"sub_submenu two" component',
+        '"submenu two" component',
+    ]
+
+
+class Loud(Composite):
+    def function(self) -> None:
+        print(f"LOUD {self.name()}")
+
+
+def test_function_dispatches_to_overrides(menu: Composite, capsys: Any) -> None:
+    loud: Loud = Loud("loud")
+    loud.append_child(Child("quiet"))
+    menu.append_child(loud)
+    menu.function()
+    assert capsys.readouterr().out.splitlines()[-1] == "LOUD loud"
+
+
+def test_append_ancestor(menu: Composite) -> None:
+    submenu: Any = next(iter(menu.children()))
+    for ancestor in (menu, submenu):
+        with pytest.raises(ValueError):
+            submenu.append_child(ancestor)
+    assert menu.size() == 5
+
+
+def test_dfs(menu: Composite) -> None:
+    assert _names(menu.dfs()) == [
+        "top_menu",
+        "submenu one",
+        "sub_submenu one",
+        "sub_submenu two",
+        "submenu two",
+    ]
+
+
+def test_bfs(menu: Composite) -> None:
+    assert _names(menu.bfs()) == [
+        "top_menu",
+        "submenu one",
+        "submenu two",
+        "sub_submenu one",
+        "sub_submenu two",
+    ]
+
+
+def test_size(menu: Composite) -> None:
+    assert menu.size() == 5
+    submenu: Any = next(iter(menu.children()))
+    submenu.append_child(Child("sub_submenu three"))
+    assert menu.size() == 6
+    assert submenu.size() == 4
+
+
+def test_remove_child(menu: Composite) -> None:
+    submenu: Any = next(iter(menu.children()))
+    menu.remove_child(submenu)
+    assert _names(menu.dfs()) == ["top_menu", "submenu two"]
+    assert menu.size() == 2
+    with pytest.raises(ValueError):
+        menu.remove_child(submenu)
+
+
+def test_append_child_moves_it(menu: Composite) -> None:
+    other: Composite = Composite("other")
+    leaf: Component = list(menu.children())[1]
+    other.append_child(leaf)
+    assert menu.size() == 4
+    assert _names(other.dfs()) == ["other", "submenu two"]
+
+
+def test_deep_tree() -> None:
+    root: Composite = Composite("0")
+    node: Composite = root
+    for level in range(1, 10_000):
+        child: Composite = Composite(str(level))
+        node.append_child(child)
+        node = child
+    assert root.size() == 10_000
+    assert sum(1 for _ in root.dfs()) == 10_000
+
+
+def test_aggregate(menu: Composite) -> None:
+    assert menu.aggregate(subtree_size) == 5
+    assert menu.aggregate(leaf_count) == 3
+    assert menu.aggregate(Sum(lambda node: len(node.name()))) == 60
+
+
+def test_aggregate_is_cached(menu: Composite) -> None:
+    measured: List[Component] = []
+
+    def measure(component: Component) -> int:
+        measured.append(component)
+        return 1
+
+    counter: Aggregate = Sum(measure)
+    assert menu.aggregate(counter) == 5
+    assert menu.aggregate(counter) == 5
+    assert len(measured) == 5
+
+
+def test_aggregate_is_invalidated(menu: Composite) -> None:
+    submenu: Any = next(iter(menu.children()))
+    assert menu.aggregate(leaf_count) == 3
+    leaf: Child = Child("sub_submenu three")
+    submenu.append_child(leaf)
+    assert menu.aggregate(leaf_count) == 4
+    submenu.remove_child(leaf)
+    assert menu.aggregate(leaf_count) == 3
+    assert submenu.aggregate(leaf_count) == 2
+
+
+@pytest.fixture
+def flat(menu: Composite) -> FlatTree:
+    return FlatTree.from_component(menu)
+
+
+def test_flat_tree_from_component(flat: FlatTree, menu: Composite) -> None:
+    assert len(flat) == 5
+    assert [flat.name(index) for index in flat.dfs()] == _names(menu.dfs())
+    assert flat.is_composite(0)
+    assert not flat.is_composite(4)
+
+
+def test_flat_tree_bulk_append(flat: FlatTree) -> None:
+    indices: range = flat.bulk_append(1, ["one", "two", "three"])
+    assert list(indices) == [5, 6, 7]
+    assert [flat.name(index) for index in flat.children(1)] == [
+        "sub_submenu one",
+        "sub_submenu two",
+        "one",
+        "two",
+        "three",
+    ]
+    assert flat.subtree_size() == 8
+    assert flat.subtree_size(1) == 6
+
+
+@pytest.mark.parametrize("parent, error", ((4, ValueError), (99, IndexError)))
+def test_flat_tree_bulk_append_wrong_parent(
+    flat: FlatTree, parent: int, error: type
+) -> None:
+    with pytest.raises(error):
+        flat.bulk_append(parent, ["leaf", "another"])
+    assert len(flat) == 5
+    assert flat.subtree_size() == 5
+
+
+def test_flat_tree_remove(flat: FlatTree) -> None:
+    flat.remove(2)
+    assert [flat.name(index) for index in flat.dfs()] == [
+        "top_menu",
+        "submenu one",
+        "sub_submenu two",
+        "submenu two",
+    ]
+    flat.remove(3)
+    flat.bulk_append(1, ["last"])
+    assert list(flat.children(1)) == [5]
+    with pytest.raises(ValueError):
+        flat.remove(0)
+    with pytest.raises(ValueError):
+        flat.remove(2)
+
+
+def test_flat_node(flat: FlatTree, capsys: Any) -> None:
+    root: FlatNode = flat.view()
+    assert not hasattr(root, "__dict__")
+    assert root.detached() == root
+    submenu: Any = next(root.children())
+    assert submenu == flat.view(1)
+    assert submenu.name() == "submenu one"
+    assert submenu.size() == 3
+    assert submenu.aggregate(subtree_size) == 3
+    assert root.aggregate(subtree_size) == root.size() == 5
+    submenu.append_child(Child("sub_submenu three"))
+    root.remove_child(flat.view(4))
+    root.function()
+    assert capsys.readouterr().out.splitlines() == [
+        '"top_menu" component',
+        '"submenu one" component',
+        '"sub_submenu one" component',
+        '"sub_submenu two" component',
+        '"sub_submenu three" component',
+    ]
+
+
+def test_composite_of_flat_nodes(flat: FlatTree, capsys: Any) -> None:
+    menu: Composite = Composite("menu")
+    submenu: FlatNode = flat.view(1)
+    menu.append_child(submenu)
+    assert list(menu.children()) == [submenu]
+    assert menu.size() == 4
+    menu.function()
+    assert capsys.readouterr().out.splitlines() == [
+        '"menu" component',
+        '"submenu one" component',
+        '"sub_submenu one" component',
+        '"sub_submenu two" component',
+    ]
+    menu.remove_child(submenu)
+    assert menu.size() == 1
+
+
+def test_process_in_parallel(menu: Composite) -> None:
+    assert process_in_parallel(menu, _name, _concatenate, 2) == _names(
+        menu.dfs()
+    )
+
+
+def test_process_unbalanced_tree_in_parallel() -> None:
+    root: Composite = Composite("root")
+    for section_number, items in enumerate((200, 20, 2, 0)):
+        section: Composite = Composite(f"section {section_number}")
+        for item_number in range(items):
+            section.append_child(Child(f"item {item_number}"))
+        root.append_child(section)
+    root.append_child(Child("leaf"))
+    assert process_in_parallel(root, _name, _concatenate, 2) == _names(
+        root.dfs()
+    )
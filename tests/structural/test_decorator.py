@@ -0,0 +1,266 @@
+import json
+import threading
+from typing import Any, Dict, List
+import pytest
+from patterns.structural.decorator import (
+    CacheInfo,
+    Float,
+    Integer,
+    MemoCache,
+    Number,
+    ProfileRegistry,
+    SumOfFloat,
+    compile_number,
+    hello_world,
+    memoize_lru,
+    memoize_sized,
+    memoize_ttl,
+    profile,
+    profiles,
+    vectorize_number,
+)
+from tests.marker import unittest
+
+pytestmark = unittest
+
+
+def test_make_blink() -> None:
+    assert hello_world(name="James") == (
+        '<blink>Hello World said "James"!</blink>'
+    )
+    assert hello_world.__name__ == "hello_world"
+
+
+def test_memoize_lru() -> None:
+    calls: List[int] = []
+
+    @memoize_lru(maxsize=2)
+    def square(number: int) -> int:
+        """Squares a number."""
+        calls.append(number)
+        return number * number
+
+    assert [square(2), square(2), square(3), square(4), square(2)] == [
+        4,
+        4,
+        9,
+        16,
+        4,
+    ]
+    assert calls == [2, 3, 4, 2]
+    assert square.__doc__ == "Squares a number."
+    assert square.cache_info() == CacheInfo(1, 4, 2, 2, 0)
+
+
+def test_memoize_keyword_arguments() -> None:
+    @memoize_lru()
+    def power(number: int, exponent: int = 2) -> int:
+        return number**exponent
+
+    assert power(2, exponent=3) == power(2, exponent=3) == 8
+    assert power(2) == 4
+    assert power.cache_info().hits == 1
+
+
+def test_memoize_invalidate() -> None:
+    calls: List[int] = []
+
+    @memoize_lru()
+    def identity(number: int) -> int:
+        calls.append(number)
+        return number
+
+    identity(1)
+    identity(2)
+    assert identity.invalidate(1)
+    assert not identity.invalidate(3)
+    identity(1)
+    identity(2)
+    assert calls == [1, 2, 1]
+    identity.cache_clear()
+    assert identity.cache_info().size == 0
+
+
+def test_memoize_ttl(monkeypatch: Any) -> None:
+    now: List[float] = [100.0]
+    monkeypatch.setattr(
+        "patterns.structural.decorator.time.monotonic", lambda: now[0]
+    )
+
+    @memoize_ttl(ttl=10)
+    def identity(number: int) -> int:
+        return number
+
+    identity(1)
+    now[0] += 5
+    identity(1)
+    now[0] += 6
+    identity(1)
+    assert identity.cache_info() == CacheInfo(1, 2, 1, 1, 0)
+
+
+def test_memoize_ttl_sweeps_unread_entries(monkeypatch: Any) -> None:
+    now: List[float] = [100.0]
+    monkeypatch.setattr(
+        "patterns.structural.decorator.time.monotonic", lambda: now[0]
+    )
+
+    @memoize_ttl(ttl=10)
+    def identity(number: int) -> int:
+        return number
+
+    for number in range(100):
+        identity(number)
+        now[0] += 1
+    assert identity.cache_info().size <= 20
+
+
+def test_memoize_keeps_args_and_kwargs_apart() -> None:
+    @memoize_lru()
+    def arguments(*args: Any, **kwargs: Any) -> Any:
+        return args, kwargs
+
+    assert arguments(1, a=2) == ((1,), {"a": 2})
+    assert arguments((1,), (("a", 2),)) == (((1,), (("a", 2),)), {})
+
+
+def test_memoize_sized() -> None:
+    @memoize_sized(max_bytes=10, sizeof=len)
+    def letters(count: int) -> str:
+        return "x" * count
+
+    letters(4)
+    letters(4)
+    letters(5)
+    assert letters.cache_info() == CacheInfo(1, 2, 0, 2, 9)
+    letters(3)
+    assert letters.cache_info() == CacheInfo(1, 3, 1, 2, 8)
+    letters(11)
+    assert letters.cache_info().size == 2
+
+
+def test_memo_cache_is_thread_safe() -> None:
+    cache: MemoCache = MemoCache(maxsize=8)
+
+    def hammer(offset: int) -> None:
+        for number in range(1_000):
+            cache.put(number + offset, number)
+            cache.get(number)
+
+    threads: List[threading.Thread] = [
+        threading.Thread(target=hammer, args=(offset,)) for offset in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info: CacheInfo = cache.info()
+    assert info.size == 8
+    assert info.hits + info.misses == 4_000
+
+
+@pytest.mark.parametrize("maxsize", (0, 1))
+def test_memoize_lru_small(maxsize: int) -> None:
+    @memoize_lru(maxsize=maxsize)
+    def identity(number: int) -> int:
+        return number
+
+    assert identity(1) == identity(1) == 1
+    assert identity.cache_info().size == maxsize
+
+
+class Doubled(Number):
+    def __init__(self, number: Number) -> None:
+        self._number: Number = number
+
+    def value(self) -> int:
+        return self._number.value() * 2
+
+
+def _tree() -> Number:
+    return SumOfFloat(
+        SumOfFloat(Integer(1), Float(Integer(2))), Doubled(Integer(3))
+    )
+
+
+def test_compile_number() -> None:
+    compiled: Any = compile_number(_tree())
+    assert compiled() == _tree().value() == 9.0
+    assert isinstance(compiled(), float)
+
+
+def test_compile_deep_number() -> None:
+    number: Number = Integer(7)
+    for _ in range(500):
+        number = Float(number)
+    number = SumOfFloat(number, Doubled(Integer(1)))
+    assert compile_number(number)() == number.value() == 9.0
+
+
+def test_vectorize_number() -> None:
+    np: Any = pytest.importorskip("numpy")
+    vectorized: Any = vectorize_number(
+        SumOfFloat(Integer(0), Float(Integer(0)))
+    )
+    result: Any = vectorized(np.arange(4), np.arange(4) * 10)
+    assert result.dtype == np.float64
+    assert result.tolist() == [0.0, 11.0, 22.0, 33.0]
+
+
+class Handler:
+    def handle(self, request: int) -> bool:
+        return request > 0
+
+
+def test_profile_demo_is_not_registered() -> None:
+    assert not any(
+        summary["name"].endswith("profiled_world")
+        for summary in profiles.report()
+    )
+
+
+def test_profile_records_calls() -> None:
+    registry: ProfileRegistry = ProfileRegistry()
+    handle: Any = profile(Handler.handle, registry=registry)
+    assert [handle(Handler(), request) for request in (1, 0, 2)] == [
+        True,
+        False,
+        True,
+    ]
+    summary: Dict[str, Any] = handle.stats.summary()
+    assert summary["name"].endswith("Handler.handle")
+    assert summary["calls"] == summary["sampled"] == 3
+    assert summary["total"] > 0
+    assert sum(summary["histogram"].values()) == 3
+
+
+def test_profile_samples_calls() -> None:
+    registry: ProfileRegistry = ProfileRegistry()
+
+    @profile(sample=4, registry=registry)
+    def hot() -> None:
+        pass
+
+    for _ in range(10):
+        hot()
+    assert hot.stats.calls == 10
+    assert hot.stats.summary()["sampled"] == 2
+
+
+def test_profile_wrong_sample() -> None:
+    with pytest.raises(ValueError):
+        profile(sample=0)
+
+
+def test_profile_report() -> None:
+    registry: ProfileRegistry = ProfileRegistry()
+
+    @profile(registry=registry)
+    def greet() -> str:
+        return "hello"
+
+    greet()
+    assert json.loads(registry.to_json())[0]["calls"] == 1
+    assert "greet" in registry.to_table().splitlines()[1]
+    registry.reset()
+    assert registry.report()[0]["calls"] == 0
@@ -0,0 +1,226 @@
+import asyncio
+import importlib.util
+import time
+from typing import Any, List
+import pytest
+from patterns.structural import facade
+from tests.marker import unittest
+
+pytestmark = unittest
+
+
+class Sleepy(facade.TestCase):
+    def __init__(self, name: str, sleep_for: float = 0.05) -> None:
+        self._name: str = name
+        self._sleep_for: float = sleep_for
+
+    def timing_key(self) -> str:
+        return self._name
+
+    def run(self) -> None:
+        print(f"start {self._name}")
+        time.sleep(self._sleep_for)
+        print(f"finish {self._name}")
+
+
+class Broken(facade.TestCase):
+    def run(self) -> None:
+        print("broken")
+        raise AssertionError("broken test case")
+
+
+def _output(name: str) -> str:
+    return f"start {name}\nfinish {name}\n"
+
+
+@pytest.mark.parametrize("processes", (False, True))
+def test_parallel_suite_replays_output(processes: bool, capsys: Any) -> None:
+    sleeps: List[float] = [0.3, 0.1, 0.2]
+    cases: List[facade.TestCase] = [
+        Sleepy(name, sleep)
+        for name, sleep in zip(("one", "two", "three"), sleeps)
+    ]
+    started: float = time.perf_counter()
+    facade.TestSuite(cases, workers=3, processes=processes).run()
+    if not processes:
+        assert time.perf_counter() - started < sum(sleeps)
+    assert capsys.readouterr().out == "".join(
+        _output(name) for name in ("one", "two", "three")
+    )
+
+
+def test_parallel_suite_raises_first_failure(capsys: Any) -> None:
+    suite: facade.TestSuite = facade.TestSuite(
+        [Sleepy("one"), Broken(), Sleepy("two")], workers=2
+    )
+    with pytest.raises(AssertionError):
+        suite.run()
+    assert capsys.readouterr().out == (
+        _output("one") + "broken\n" + _output("two")
+    )
+
+
+def test_parallel_suite_fails_fast(capsys: Any) -> None:
+    suite: facade.TestSuite = facade.TestSuite(
+        [Broken(), Sleepy("one", 0.1), Sleepy("two"), Sleepy("three")],
+        workers=2,
+        fail_fast=True,
+    )
+    with pytest.raises(AssertionError):
+        suite.run()
+    assert capsys.readouterr().out == "broken\n" + _output("one")
+
+
+def test_suite_wrong_workers() -> None:
+    with pytest.raises(ValueError):
+        facade.TestSuite([], workers=0)
+
+
+class Napping(facade.AsyncTestCase):
+    def __init__(self, name: str, sleep_for: float = 0.05) -> None:
+        self._name: str = name
+        self._sleep_for: float = sleep_for
+
+    async def run(self) -> None:
+        print(f"start {self._name}")
+        await asyncio.sleep(self._sleep_for)
+        if self._sleep_for < 0:
+            raise AssertionError("negative sleep")
+        print(f"finish {self._name}")
+
+
+def _run_async(suite: facade.AsyncTestSuite) -> List[facade.TestResult]:
+    return asyncio.run(suite.run())
+
+
+def test_async_suite_runs_concurrently() -> None:
+    started: float = time.perf_counter()
+    results: List[facade.TestResult] = _run_async(
+        facade.AsyncTestSuite([Napping(str(index), 0.1) for index in range(50)])
+    )
+    assert time.perf_counter() - started < 1
+    assert [result.output for result in results] == [
+        _output(str(index)) for index in range(50)
+    ]
+    assert all(result.status is facade.Status.PASSED for result in results)
+    assert all(result.duration >= 0.1 for result in results)
+
+
+def test_import_inside_event_loop() -> None:
+    async def load() -> None:
+        spec: Any = importlib.util.find_spec(facade.__name__)
+        spec.loader.exec_module(importlib.util.module_from_spec(spec))
+
+    asyncio.run(load())
+
+
+def test_async_suite_limits_concurrency() -> None:
+    started: float = time.perf_counter()
+    _run_async(
+        facade.AsyncTestSuite(
+            [Napping(str(index), 0.05) for index in range(4)], concurrency=2
+        )
+    )
+    assert time.perf_counter() - started >= 0.1
+
+
+def test_async_suite_reports_failures() -> None:
+    results: List[facade.TestResult] = _run_async(
+        facade.AsyncTestSuite(
+            [Napping("slow", 1), Napping("broken", -1), Napping("fast")],
+            timeout=0.2,
+        )
+    )
+    assert [result.status for result in results] == [
+        facade.Status.TIMEOUT,
+        facade.Status.FAILED,
+        facade.Status.PASSED,
+    ]
+    assert results[0].output == "start slow\n"
+    assert results[0].duration < 1
+    assert isinstance(results[1].error, AssertionError)
+
+
+def test_async_suite_wrong_concurrency() -> None:
+    with pytest.raises(ValueError):
+        facade.AsyncTestSuite([], concurrency=0)
+
+
+def test_schedule_packs_longest_first() -> None:
+    plan: facade.Schedule = facade.schedule([1.0, 2.0, 5.0, 3.0, 2.0], 2)
+    assert plan.order == [2, 3, 1, 4, 0]
+    assert plan.bins == [[2, 4], [3, 1, 0]]
+    assert plan.predicted == 7.0
+
+
+def test_timing_store_estimates(tmp_path: Any) -> None:
+    path: str = str(tmp_path / "timings.json")
+    store: facade.TimingStore = facade.TimingStore(path, default=0.5)
+    store.record("one", 2.0)
+    store.save()
+    loaded: facade.TimingStore = facade.TimingStore(path, default=0.5)
+    assert loaded.estimate("one") == 2.0
+    assert loaded.estimate("two") == 0.5
+
+
+def test_suite_schedules_by_recorded_durations(
+    tmp_path: Any, capsys: Any
+) -> None:
+    store: facade.TimingStore = facade.TimingStore(
+        str(tmp_path / "timings.json"), default=0.01
+    )
+    sleeps: List[float] = [0.1, 0.1, 0.4]
+    cases: List[facade.TestCase] = [
+        Sleepy(name, sleep)
+        for name, sleep in zip(("one", "two", "long"), sleeps)
+    ]
+    facade.TestSuite(cases, workers=2, timings=store).run()
+    assert store.estimate(cases[2].timing_key()) >= 0.4
+    capsys.readouterr()
+    makespan: facade.Makespan = facade.TestSuite(
+        cases, workers=2, timings=store
+    ).run()
+    assert 0.4 <= makespan.predicted < sum(sleeps)
+    assert makespan.actual < sum(sleeps)
+    assert capsys.readouterr().out == "".join(
+        _output(name) for name in ("one", "two", "long")
+    )
+
+
+def test_sequential_suite_records_durations(tmp_path: Any) -> None:
+    store: facade.TimingStore = facade.TimingStore(
+        str(tmp_path / "timings.json")
+    )
+    case: Sleepy = Sleepy("one")
+    makespan: facade.Makespan = facade.TestSuite([case], timings=store).run()
+    assert makespan.predicted == 1.0
+    assert makespan.actual >= store.estimate(case.timing_key()) >= 0.05
+
+
+class Named(facade.TestCase):
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+    def run(self) -> None:
+        print(self.name)
+
+
+def test_sequential_suite_keeps_order(tmp_path: Any, capsys: Any) -> None:
+    store: facade.TimingStore = facade.TimingStore(
+        str(tmp_path / "timings.json")
+    )
+    store.record("long", 5.0)
+    cases: List[facade.TestCase] = [Sleepy("short", 0), Sleepy("long", 0)]
+    makespan: facade.Makespan = facade.TestSuite(cases, timings=store).run()
+    assert makespan.predicted == 6.0
+    assert capsys.readouterr().out == _output("short") + _output("long")
+
+
+def test_suite_times_cases_by_class(tmp_path: Any, capsys: Any) -> None:
+    store: facade.TimingStore = facade.TimingStore(
+        str(tmp_path / "timings.json")
+    )
+    facade.TestSuite([Named("one")], timings=store).run()
+    assert capsys.readouterr().out == "one\n"
+    assert Named("one").timing_key() == f"{__name__}.Named"
+    assert store.estimate(Named("one").timing_key()) < 1.0
@@ -0,0 +1,360 @@
+import gc
+import io
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List
+import pytest
+from patterns.structural.mvc import (
+    CacheStats,
+    ColumnarProductModel,
+    ConsoleView,
+    ItemController,
+    Model,
+    ProductModel,
+    SQLiteProductModel,
+)
+from tests.marker import unittest
+
+pytestmark = unittest
+
+
+@pytest.fixture
+def sqlite_model() -> Iterator[SQLiteProductModel]:
+    model: SQLiteProductModel = SQLiteProductModel(page=2)
+    model.load((("milk", 1.5, 10), ("eggs", 0.2, 100), ("cheese", 2.0, 10)))
+    yield model
+    model.close()
+
+
+@pytest.fixture
+def columnar_model() -> ColumnarProductModel:
+    model: ColumnarProductModel = ColumnarProductModel()
+    model.load((("milk", 1.5, 10), ("eggs", 0.2, 100), ("cheese", 2.0, 10)))
+    return model
+
+
+def test_sqlite_model_get(sqlite_model: SQLiteProductModel) -> None:
+    info: Any = sqlite_model.get("eggs")
+    assert str(info["price"]) == "0.20"
+    assert info["quantity"] == 100
+
+
+def test_sqlite_model_missing_item(sqlite_model: SQLiteProductModel) -> None:
+    with pytest.raises(KeyError):
+        sqlite_model.get("arepas")
+
+
+def test_sqlite_model_streams_names(sqlite_model: SQLiteProductModel) -> None:
+    assert list(sqlite_model) == ["milk", "eggs", "cheese"]
+
+
+def test_sqlite_model_lookups_while_iterating() -> None:
+    model: SQLiteProductModel = SQLiteProductModel(pool_size=1, page=2)
+    model.load((("milk", 1.5, 10), ("eggs", 0.2, 100), ("cheese", 2.0, 10)))
+    assert [model.get(name)["quantity"] for name in model] == [10, 100, 10]
+    model.close()
+
+
+def test_sqlite_model_replaces_items(sqlite_model: SQLiteProductModel) -> None:
+    sqlite_model.load((("milk", 1.75, 5),))
+    assert sqlite_model.get("milk") == {"price": 1.75, "quantity": 5}
+
+
+def test_sqlite_model_threaded_lookups(
+    sqlite_model: SQLiteProductModel,
+) -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        quantities: List[int] = list(
+            executor.map(
+                lambda name: sqlite_model.get(name)["quantity"],
+                ["milk", "eggs", "cheese"] * 50,
+            )
+        )
+    assert quantities == [10, 100, 10] * 50
+
+
+def test_sqlite_model_reads_during_load(
+    sqlite_model: SQLiteProductModel,
+) -> None:
+    def read() -> int:
+        return sum(
+            sqlite_model.get(name)["quantity"]
+            for _ in range(200)
+            for name in ("milk", "eggs", "cheese")
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        readers: List[Any] = [executor.submit(read) for _ in range(3)]
+        for batch in range(20):
+            sqlite_model.load(
+                (f"product-{batch}-{index}", 1.0, index) for index in range(500)
+            )
+        assert [reader.result() for reader in readers] == [120 * 200] * 3
+    assert len(list(sqlite_model)) == 3 + 20 * 500
+
+
+def test_sqlite_model_controller(
+    sqlite_model: SQLiteProductModel, capsys: Any
+) -> None:
+    controller: ItemController = ItemController(sqlite_model, ConsoleView())
+    controller.show_item_information("cheese")
+    controller.show_item_information("arepas")
+    assert capsys.readouterr().out == (
+        "PRODUCT INFORMATION:\n"
+        "Name: cheese, Price: 2.00, Quantity: 10\n\n"
+        'That "product" "arepas" does not exist in the records\n'
+    )
+
+
+def test_columnar_model_get(columnar_model: ColumnarProductModel) -> None:
+    info: Any = columnar_model.get("eggs")
+    assert str(info["price"]) == "0.20"
+    assert info["price"] == 0.2
+    assert info["quantity"] == 100
+    with pytest.raises(KeyError):
+        columnar_model.get("arepas")
+
+
+def test_columnar_model_replaces_items(
+    columnar_model: ColumnarProductModel,
+) -> None:
+    columnar_model.load((("milk", 1.75, 5), ("bread", 3.1, 1)))
+    assert list(columnar_model) == ["milk", "eggs", "cheese", "bread"]
+    assert str(columnar_model.get("milk")["price"]) == "1.75"
+    assert columnar_model.get("milk") == {"price": 1.75, "quantity": 5}
+    assert len(columnar_model) == 4
+
+
+def test_columnar_model_negative_price(
+    columnar_model: ColumnarProductModel,
+) -> None:
+    with pytest.raises(ValueError):
+        columnar_model.load((("debt", -1.0, 1),))
+
+
+@pytest.mark.parametrize(
+    "price, quantity, error",
+    (
+        (2.0, 2**40, OverflowError),
+        (2.0, 1.5, TypeError),
+        (1e17, 1, OverflowError),
+    ),
+)
+def test_columnar_model_rejects_rows(
+    columnar_model: ColumnarProductModel,
+    price: float,
+    quantity: Any,
+    error: Any,
+) -> None:
+    changes: List[Any] = []
+    columnar_model.add_listener(changes.append)
+    with pytest.raises(error):
+        columnar_model.load(
+            (("bread", 3.1, 1), ("butter", price, quantity), ("jam", 4.0, 3))
+        )
+    assert changes == [["bread"]]
+    assert list(columnar_model) == ["milk", "eggs", "cheese", "bread"]
+    assert columnar_model.find("butter") is None
+    assert columnar_model.get("bread") == {"price": 3.1, "quantity": 1}
+    assert columnar_model.format_prices() == ["1.50", "0.20", "2.00", "3.10"]
+    columnar_model.load((("jam", 4.0, 3),))
+    assert columnar_model.get("jam") == {"price": 4.0, "quantity": 3}
+
+
+@pytest.mark.parametrize(
+    "price", (0.0, 0.05, 0.2, 1.5, 2.0, 10.01, 123456.78, 99.999)
+)
+def test_columnar_model_formats_prices(price: float) -> None:
+    model: ColumnarProductModel = ColumnarProductModel()
+    model.load((("item", price, 1),))
+    assert model.format_prices() == [str(ProductModel.Price(price))]
+    assert str(model.get("item")["price"]) == str(ProductModel.Price(price))
+
+
+def test_columnar_model_formats_price_range(
+    columnar_model: ColumnarProductModel,
+) -> None:
+    assert columnar_model.format_prices(1) == ["0.20", "2.00"]
+    assert columnar_model.format_prices(0, 1) == ["1.50"]
+
+
+_listing: str = "PRODUCT LIST:\nmilk\neggs\ncheese\n\n\n"
+
+
+@pytest.mark.parametrize("size", (1, 2, 3, 4))
+def test_model_pages(
+    sqlite_model: SQLiteProductModel,
+    columnar_model: ColumnarProductModel,
+    size: int,
+) -> None:
+    for model in (ProductModel(), sqlite_model, columnar_model):
+        controller: ItemController = ItemController(
+            model, ConsoleView(), page_size=size
+        )
+        pages: List[List[str]] = list(controller.pages())
+        assert all(0 < len(page) <= size for page in pages)
+        assert [item for page in pages for item in page] == [
+            "milk",
+            "eggs",
+            "cheese",
+        ]
+
+
+class IteratedModel(ProductModel):
+    def __init__(self) -> None:
+        super().__init__()
+        self.iterated: int = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for item in super().__iter__():
+            self.iterated += 1
+            yield item
+
+
+def test_default_pages_iterate_once() -> None:
+    model: IteratedModel = IteratedModel()
+    pages: List[List[str]] = list(
+        ItemController(model, ConsoleView(), page_size=1).pages()
+    )
+    assert pages == [["milk"], ["eggs"], ["cheese"]]
+    assert model.iterated == 3
+
+
+def test_show_items_streams_pages(sqlite_model: SQLiteProductModel) -> None:
+    sink: io.StringIO = io.StringIO()
+    ItemController(sqlite_model, ConsoleView(sink), page_size=2).show_items()
+    assert sink.getvalue() == _listing
+
+
+def test_console_view_writes_to_sink(capsys: Any) -> None:
+    sink: io.StringIO = io.StringIO()
+    controller: ItemController = ItemController(
+        ProductModel(), ConsoleView(sink)
+    )
+    controller.show_items()
+    controller.show_item_information("milk")
+    controller.show_item_information("arepas")
+    ConsoleView(sink).show_item_list("product", ["milk"])
+    assert not capsys.readouterr().out
+    assert sink.getvalue() == (
+        _listing + "PRODUCT INFORMATION:\n"
+        "Name: milk, Price: 1.50, Quantity: 10\n\n"
+        'That "product" "arepas" does not exist in the records\n'
+        "PRODUCT LIST:\nmilk\n\n\n"
+    )
+
+
+def test_show_items_matches_item_list(capsys: Any) -> None:
+    model: Model = ProductModel()
+    view: ConsoleView = ConsoleView()
+    view.show_item_list(model.item_type, list(model))
+    listed: str = capsys.readouterr().out
+    ItemController(model, view).show_items()
+    assert capsys.readouterr().out == listed == _listing
+
+
+class CountingModel(ProductModel):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups: List[str] = []
+
+    def find(self, item: str) -> Any:
+        self.lookups.append(item)
+        return super().find(item)
+
+
+def test_controller_reads_through_cache(capsys: Any) -> None:
+    model: CountingModel = CountingModel()
+    controller: ItemController = ItemController(model, ConsoleView())
+    for name in ("milk", "milk", "arepas", "arepas", "milk"):
+        controller.show_item_information(name)
+    assert model.lookups == ["milk", "arepas"]
+    assert capsys.readouterr().out.count("does not exist") == 2
+    stats: CacheStats = controller.cache_stats()
+    assert stats == CacheStats(hits=3, negative_hits=1, misses=2, size=2)
+    assert stats.hit_ratio == 0.6
+
+
+def test_controller_cache_is_bounded() -> None:
+    model: CountingModel = CountingModel()
+    controller: ItemController = ItemController(
+        model, ConsoleView(), cache_size=2
+    )
+    for name in ("milk", "eggs", "cheese", "milk"):
+        controller.show_item_information(name)
+    assert model.lookups == ["milk", "eggs", "cheese", "milk"]
+    assert controller.cache_stats().size == 2
+
+
+@pytest.mark.parametrize(
+    "model_type", (SQLiteProductModel, ColumnarProductModel)
+)
+def test_controller_cache_invalidation(model_type: Any, capsys: Any) -> None:
+    model: Any = model_type()
+    controller: ItemController = ItemController(model, ConsoleView())
+    controller.show_item_information("bread")
+    model.load((("bread", 3.1, 1),))
+    controller.show_item_information("bread")
+    assert capsys.readouterr().out.endswith(
+        "Name: bread, Price: 3.10, Quantity: 1\n\n"
+    )
+    model.load((("bread", 3.5, 2),))
+    controller.show_item_information("bread")
+    assert "Price: 3.50, Quantity: 2" in capsys.readouterr().out
+
+
+class Inventory(ProductModel):
+    def __init__(self) -> None:  # pylint: disable=super-init-not-called
+        self.products: Any = {"milk": {"price": 1.5, "quantity": 10}}
+
+    def restock(self, item: str, quantity: int) -> None:
+        self.products[item]["quantity"] = quantity
+        self._changed([item])
+
+
+def test_listeners_without_model_init() -> None:
+    model: Inventory = Inventory()
+    changes: List[Any] = []
+    model.add_listener(changes.append)
+    model.restock("milk", 5)
+    assert changes == [["milk"]]
+    model.remove_listener(changes.append)
+    model.restock("milk", 4)
+    assert changes == [["milk"]]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.changes: List[Any] = []
+
+    def record(self, items: Any) -> None:
+        self.changes.append(items)
+
+
+def test_listener_methods_are_weak() -> None:
+    model: Inventory = Inventory()
+    recorder: Recorder = Recorder()
+    model.add_listener(recorder.record)
+    model.restock("milk", 5)
+    assert recorder.changes == [["milk"]]
+    reference: Any = weakref.ref(recorder)
+    del recorder
+    gc.collect()
+    assert reference() is None
+    model.restock("milk", 4)
+
+
+class ReloadingModel(ColumnarProductModel):
+    def find(self, item: str) -> Any:
+        info: Any = super().find(item)
+        self.load(((item, 2.0, 1),))
+        return info
+
+
+def test_controller_skips_stale_lookups(capsys: Any) -> None:
+    model: ReloadingModel = ReloadingModel()
+    controller: ItemController = ItemController(model, ConsoleView())
+    controller.show_item_information("milk")
+    assert controller.cache_stats().size == 0
+    controller.show_item_information("milk")
+    assert "Price: 2.00, Quantity: 1" in capsys.readouterr().out